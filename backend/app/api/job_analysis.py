@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -55,11 +56,11 @@ async def analyze_job_description(
     # Analyze job description
     analyzer = JobAnalyzerService()
     try:
-        requirements = analyzer.analyze_job_description(request.job_description)
+        requirements = await analyzer.analyze_job_description_async(request.job_description)
         confidence_score = analyzer.get_confidence_score(requirements)
         
         # Update job analysis with results
-        job_analysis.extracted_requirements = requirements.model_dump()
+        job_analysis.extracted_requirements = asdict(requirements)
         job_analysis.confidence_score = confidence_score
         job_analysis.is_processed = True
         
@@ -72,6 +73,9 @@ async def analyze_job_description(
         job_analysis.is_processed = True
         await db.commit()
         await db.refresh(job_analysis)
+    finally:
+        # The analyzer is per request, so release its pooled OpenAI connections now
+        await analyzer.aclose()
     
     return JobAnalysisResponse(
         id=job_analysis.id,
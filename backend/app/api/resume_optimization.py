@@ -1,7 +1,9 @@
 """Resume optimization and export API endpoints"""
 from typing import List, Dict, Optional
+import orjson
+from dataclasses import asdict
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
@@ -17,6 +19,13 @@ from app.services.latex_generator import LaTeXGeneratorService, LaTeXResumeReque
 
 router = APIRouter()
 
+def _sse_event(payload: Dict) -> str:
+    """Serialize a payload as a Server-Sent Event data line"""
+    return f"data: {orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()}\n\n"
+
+# Shared optimizer so its pooled AI client connections are reused across requests
+resume_optimizer = ResumeOptimizerService()
+
 class OptimizeResumeRequest(BaseModel):
     """Request model for resume optimization"""
     resume_id: int
@@ -51,13 +60,12 @@ class ExportResumeRequest(BaseModel):
     optimization_request: OptimizeResumeRequest
     latex_request: LaTeXResumeRequest
 
-@router.post("/optimize", response_model=OptimizedResumeResponse)
-async def optimize_resume(
+async def _load_optimization_inputs(
     request: OptimizeResumeRequest,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_database)
-):
-    """Optimize a resume for a specific job"""
+    current_user: User,
+    db: AsyncSession
+) -> tuple[Resume, JobAnalysis, List[Dict], ResumeOptimizationRequest]:
+    """Load the user's resume, job analysis and approved projects for optimization"""
     
     # Verify resume belongs to user
     resume_result = await db.execute(
@@ -83,42 +91,55 @@ async def optimize_resume(
     if not job_analysis:
         raise HTTPException(status_code=404, detail="Job analysis not found")
     
-    try:
-        # Get generated projects for this resume and job
-        projects_result = await db.execute(
-            select(GeneratedProject).where(
-                GeneratedProject.resume_id == request.resume_id,
-                GeneratedProject.job_analysis_id == request.job_analysis_id,
-                GeneratedProject.user_id == current_user.id,
-                GeneratedProject.is_approved == True
-            )
-        )
-        generated_projects = projects_result.scalars().all()
-        
-        # Convert to dict format
-        projects_data = []
-        for project in generated_projects:
-            projects_data.append({
-                "title": project.title,
-                "description": project.description,
-                "technologies_used": project.technologies_used,
-                "deliverables": project.deliverables
-            })
-        
-        # Create optimization request
-        optimization_request = ResumeOptimizationRequest(
-            target_job_title=request.target_job_title,
-            target_company=request.target_company,
-            target_industry=request.target_industry,
-            optimization_focus=request.optimization_focus,
-            include_projects=request.include_projects,
-            max_pages=request.max_pages,
-            format_style=request.format_style
+    # Get generated projects for this resume and job
+    projects_result = await db.execute(
+        select(GeneratedProject).where(
+            GeneratedProject.resume_id == request.resume_id,
+            GeneratedProject.job_analysis_id == request.job_analysis_id,
+            GeneratedProject.user_id == current_user.id,
+            GeneratedProject.is_approved == True
         )
-        
+    )
+    generated_projects = projects_result.scalars().all()
+    
+    # Convert to dict format
+    projects_data = []
+    for project in generated_projects:
+        projects_data.append({
+            "title": project.title,
+            "description": project.description,
+            "technologies_used": project.technologies_used,
+            "deliverables": project.deliverables
+        })
+    
+    # Create optimization request
+    optimization_request = ResumeOptimizationRequest(
+        target_job_title=request.target_job_title,
+        target_company=request.target_company,
+        target_industry=request.target_industry,
+        optimization_focus=request.optimization_focus,
+        include_projects=request.include_projects,
+        max_pages=request.max_pages,
+        format_style=request.format_style
+    )
+    
+    return resume, job_analysis, projects_data, optimization_request
+
+@router.post("/optimize", response_model=OptimizedResumeResponse)
+async def optimize_resume(
+    request: OptimizeResumeRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Optimize a resume for a specific job"""
+    
+    resume, job_analysis, projects_data, optimization_request = await _load_optimization_inputs(
+        request, current_user, db
+    )
+    
+    try:
         # Optimize resume
-        optimizer = ResumeOptimizerService()
-        optimized_resume = optimizer.optimize_resume(
+        optimized_resume = await resume_optimizer.optimize_resume_async(
             resume_data=resume.parsed_data,
             job_requirements=job_analysis.extracted_requirements,
             request=optimization_request,
@@ -130,7 +151,7 @@ async def optimize_resume(
             professional_summary=optimized_resume.professional_summary,
             skills_section=optimized_resume.skills_section,
             experience_section=optimized_resume.experience_section,
-            education_section=optimized_resume.education_section,
+            education_section=[asdict(edu) for edu in optimized_resume.education_section],
             projects_section=optimized_resume.projects_section,
             section_order=optimized_resume.section_order,
             formatting_style=optimized_resume.formatting_style,
@@ -149,6 +170,37 @@ async def optimize_resume(
             detail=f"Error optimizing resume: {str(e)}"
         )
 
+@router.post("/optimize/stream")
+async def stream_optimize_resume(
+    request: OptimizeResumeRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Stream optimized resume sections as Server-Sent Events as soon as each is ready"""
+    
+    resume, job_analysis, projects_data, optimization_request = await _load_optimization_inputs(
+        request, current_user, db
+    )
+    
+    async def generate_sections():
+        """Generate streaming sections"""
+        async for event in resume_optimizer.stream_optimization_events(
+            resume_data=resume.parsed_data,
+            job_requirements=job_analysis.extracted_requirements,
+            request=optimization_request,
+            generated_projects=projects_data
+        ):
+            yield _sse_event(event)
+    
+    return StreamingResponse(
+        generate_sections(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        }
+    )
+
 @router.post("/export/latex")
 async def export_resume_latex(
     request: ExportResumeRequest,
@@ -308,15 +360,14 @@ async def get_resume_templates():
 async def get_ats_keywords(industry: str):
     """Get ATS keywords for specific industry"""
     
-    optimizer = ResumeOptimizerService()
-    keywords = optimizer.ats_keywords.get("industry_terms", {}).get(industry.lower(), [])
+    keywords = resume_optimizer.ats_keywords.get("industry_terms", {}).get(industry.lower(), [])
     
     return {
         "industry": industry,
         "keywords": keywords,
-        "action_verbs": optimizer.ats_keywords["action_verbs"][:20],
-        "technical_skills": optimizer.ats_keywords["technical_skills"][:15],
-        "soft_skills": optimizer.ats_keywords["soft_skills"][:10]
+        "action_verbs": resume_optimizer.ats_keywords["action_verbs"][:20],
+        "technical_skills": resume_optimizer.ats_keywords["technical_skills"][:15],
+        "soft_skills": resume_optimizer.ats_keywords["soft_skills"][:10]
     }
 
 @router.post("/score")
@@ -351,8 +402,6 @@ async def calculate_resume_score(
         raise HTTPException(status_code=404, detail="Job analysis not found")
     
     try:
-        optimizer = ResumeOptimizerService()
-        
         # Create a minimal optimized data structure for scoring
         minimal_optimized = {
             "skills_section": {"all_skills": resume.parsed_data.get("skills", [])},
@@ -363,8 +412,9 @@ async def calculate_resume_score(
             "professional_summary": resume.parsed_data.get("summary", "")
         }
         
-        ats_score = optimizer._calculate_ats_score(minimal_optimized, job_analysis.extracted_requirements)
-        keyword_density = optimizer._calculate_keyword_density(minimal_optimized, job_analysis.extracted_requirements)
+        normalized_text = resume_optimizer._normalize_scoring_text(minimal_optimized)
+        ats_score = resume_optimizer._calculate_ats_score(minimal_optimized, job_analysis.extracted_requirements, normalized_text)
+        keyword_density = resume_optimizer._calculate_keyword_density(minimal_optimized, job_analysis.extracted_requirements, normalized_text)
         
         return {
             "ats_score": ats_score,
@@ -1,5 +1,5 @@
+import io
 import os
-import tempfile
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -63,11 +63,6 @@ async def upload_resume(
                 detail=f"File too large. Maximum size: {max_size / (1024*1024):.1f}MB"
             )
         
-        # Save file temporarily for processing
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            tmp_file.write(file_content)
-            tmp_file_path = tmp_file.name
-        
         # Create resume record
         resume = Resume(
             user_id=current_user.id,
@@ -84,11 +79,12 @@ async def upload_resume(
         # Parse resume in background
         parser = ResumeParserService()
         try:
-            parsed_data = parser.parse_resume(tmp_file_path, file_size)
+            # Parse straight from the uploaded bytes, without a temporary copy on disk
+            parsed_data = parser.parse_resume(io.BytesIO(file_content), file_size, suffix=file_extension)
             
-            # Update resume with parsed data
-            resume.raw_text = parser.extract_text(tmp_file_path)
-            resume.parsed_data = parsed_data.model_dump()
+            # Update resume with parsed data, reusing the text the parser already extracted
+            resume.raw_text = parsed_data.raw_text
+            resume.parsed_data = parsed_data.model_dump(exclude={"raw_text"})
             resume.full_name = parsed_data.personal_info.get("name")
             resume.email = parsed_data.personal_info.get("email")
             resume.phone = parsed_data.personal_info.get("phone")
@@ -121,12 +117,8 @@ async def upload_resume(
             await db.refresh(resume)
         
         finally:
-            # Clean up temporary file
-            try:
-                os.unlink(tmp_file_path)
-                parser.cleanup()
-            except Exception:
-                pass
+            # Clean up any scratch files the parser created
+            parser.cleanup()
         
         return ResumeResponse(
             id=resume.id,
@@ -1,7 +1,9 @@
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 import logging
 from app.api import health, auth, resumes, job_analysis, gap_analysis, project_generation, resume_optimization, realtime_optimization
 from app.core.config import settings
+from app.services.job_analyzer import close_shared_redis_client
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +16,7 @@ app = FastAPI(
     title="Resume AI API",
     description="AI-powered resume optimization and project generation",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 @app.on_event("startup")
@@ -23,6 +26,13 @@ async def startup_event():
     logger.info(f"Database URL: {settings.DATABASE_URL}")
     logger.info("===== Startup Complete =====")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Close the pooled clients the long-lived services opened on the server loop
+    await resume_optimization.resume_optimizer.aclose()
+    await realtime_optimization.realtime_optimizer.resume_optimizer.aclose()
+    await close_shared_redis_client()
+
 # Add request logging middleware
 @app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
@@ -91,4 +101,5 @@ async def debug_test():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop must be selected before the server creates its event loop
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop")
\ No newline at end of file
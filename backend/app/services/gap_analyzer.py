@@ -1,108 +1,200 @@
-from typing import Dict, List, Optional, Tuple, Any
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple, Any
 import re
-from difflib import SequenceMatcher
+from rapidfuzz import fuzz, process
 
-class GapAnalysisResult(BaseModel):
+from app.services.keyword_matcher import build_automaton, find_whole_words
+
+# Common technologies to look for in experience text
+TECH_KEYWORDS = (
+    'python', 'javascript', 'java', 'typescript', 'php', 'ruby', 'go', 'rust',
+    'react', 'angular', 'vue', 'nodejs', 'express', 'django', 'flask', 'fastapi',
+    'postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'elasticsearch',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'jenkins',
+    'git', 'jira', 'confluence', 'slack', 'figma'
+)
+
+# Technology automaton, matched as whole words in one linear scan
+_TECH_AUTOMATON = build_automaton(TECH_KEYWORDS)
+
+_SKILL_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\+\#\.]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=4096)
+def _normalize_skill(skill: str) -> str:
+    """Normalize a skill name; skill vocabularies repeat heavily, so results are memoized"""
+    skill = skill.lower()
+    skill = _SKILL_SPECIAL_CHARS_RE.sub('', skill)  # Remove special chars except +, #, .
+    skill = _WHITESPACE_RE.sub(' ', skill).strip()  # Normalize whitespace
+    return skill
+
+# Skill synonyms and variations, keyed by canonical skill
+SKILL_SYNONYMS = {
+    'javascript': ['js', 'ecmascript', 'javascript'],
+    'typescript': ['ts', 'typescript'],
+    'python': ['python', 'python3', 'py'],
+    'java': ['java', 'openjdk'],
+    'react': ['react.js', 'reactjs', 'react'],
+    'node': ['node.js', 'nodejs', 'node'],
+    'postgresql': ['postgres', 'postgresql', 'psql'],
+    'mongodb': ['mongo', 'mongodb'],
+    'aws': ['amazon web services', 'aws'],
+    'gcp': ['google cloud', 'gcp', 'google cloud platform'],
+    'azure': ['microsoft azure', 'azure'],
+    'docker': ['docker', 'containerization'],
+    'kubernetes': ['k8s', 'kubernetes'],
+    'fastapi': ['fastapi', 'fast api'],
+    'django': ['django'],
+    'flask': ['flask'],
+    'express': ['express.js', 'expressjs', 'express'],
+    'redis': ['redis'],
+    'git': ['git', 'version control'],
+    'ci/cd': ['ci/cd', 'continuous integration', 'continuous deployment', 'devops'],
+}
+
+# Synonym -> canonical skill, so synonym pairs compare by a single lookup
+_SYNONYM_CANONICAL = {
+    synonym: canonical
+    for canonical, synonyms in SKILL_SYNONYMS.items()
+    for synonym in synonyms
+}
+
+
+@lru_cache(maxsize=256)
+def _index_skills(skills: Tuple[str, ...]) -> Tuple[Tuple[str, ...], FrozenSet[str], FrozenSet[str]]:
+    """Normalize a resume's skills into (ordered tuple, set, canonical synonym set), keyed on content"""
+    normalized = tuple(map(_normalize_skill, skills))
+    canonical = frozenset(_SYNONYM_CANONICAL.get(skill, skill) for skill in normalized)
+    return normalized, frozenset(normalized), canonical
+
+
+@dataclass(slots=True)
+class GapAnalysisResult:
     """Gap analysis result data model"""
     overall_match_score: float = 0.0
     
     # Skills analysis
-    matching_skills: List[str] = []
-    missing_required_skills: List[str] = []
-    missing_preferred_skills: List[str] = []
+    matching_skills: List[str] = field(default_factory=list)
+    missing_required_skills: List[str] = field(default_factory=list)
+    missing_preferred_skills: List[str] = field(default_factory=list)
     
     # Experience analysis
     experience_gap: Optional[int] = None  # Years short, negative if exceeds
     experience_level_match: bool = False
     
     # Technology analysis
-    matching_technologies: List[str] = []
-    missing_technologies: List[str] = []
+    matching_technologies: List[str] = field(default_factory=list)
+    missing_technologies: List[str] = field(default_factory=list)
     
     # Programming languages
-    matching_languages: List[str] = []
-    missing_languages: List[str] = []
+    matching_languages: List[str] = field(default_factory=list)
+    missing_languages: List[str] = field(default_factory=list)
     
     # Frameworks
-    matching_frameworks: List[str] = []
-    missing_frameworks: List[str] = []
+    matching_frameworks: List[str] = field(default_factory=list)
+    missing_frameworks: List[str] = field(default_factory=list)
     
     # Databases
-    matching_databases: List[str] = []
-    missing_databases: List[str] = []
+    matching_databases: List[str] = field(default_factory=list)
+    missing_databases: List[str] = field(default_factory=list)
     
     # Cloud platforms
-    matching_cloud_platforms: List[str] = []
-    missing_cloud_platforms: List[str] = []
+    matching_cloud_platforms: List[str] = field(default_factory=list)
+    missing_cloud_platforms: List[str] = field(default_factory=list)
     
     # Recommendations
-    recommendations: List[str] = []
-    improvement_priority: List[Dict[str, Any]] = []
+    recommendations: List[str] = field(default_factory=list)
+    improvement_priority: List[Dict[str, Any]] = field(default_factory=list)
 
 class GapAnalyzerService:
     """Service for analyzing gaps between resume and job requirements"""
     
+    # Experience level ranks; unknown levels count as entry level
+    LEVEL_RANKS = {
+        'entry': 1,
+        'junior': 1,
+        'mid': 2,
+        'intermediate': 2,
+        'senior': 3,
+        'lead': 4,
+        'principal': 4,
+        'executive': 5
+    }
+    
+    # Improvement priorities: (category, gap result attribute, priority score, urgency)
+    PRIORITY_TABLE = (
+        ('Required Skill', 'missing_required_skills', 10, 'Critical'),
+        ('Programming Language', 'missing_languages', 8, 'High'),
+        ('Framework', 'missing_frameworks', 7, 'High'),
+        ('Database', 'missing_databases', 6, 'Medium'),
+        ('Cloud Platform', 'missing_cloud_platforms', 6, 'Medium'),
+        ('Preferred Skill', 'missing_preferred_skills', 4, 'Low'),
+    )
+    
     def __init__(self):
-        # Skill synonyms and variations
-        self.skill_synonyms = {
-            'javascript': ['js', 'ecmascript', 'javascript'],
-            'typescript': ['ts', 'typescript'],
-            'python': ['python', 'python3', 'py'],
-            'java': ['java', 'openjdk'],
-            'react': ['react.js', 'reactjs', 'react'],
-            'node': ['node.js', 'nodejs', 'node'],
-            'postgresql': ['postgres', 'postgresql', 'psql'],
-            'mongodb': ['mongo', 'mongodb'],
-            'aws': ['amazon web services', 'aws'],
-            'gcp': ['google cloud', 'gcp', 'google cloud platform'],
-            'azure': ['microsoft azure', 'azure'],
-            'docker': ['docker', 'containerization'],
-            'kubernetes': ['k8s', 'kubernetes'],
-            'fastapi': ['fastapi', 'fast api'],
-            'django': ['django'],
-            'flask': ['flask'],
-            'express': ['express.js', 'expressjs', 'express'],
-            'redis': ['redis'],
-            'git': ['git', 'version control'],
-            'ci/cd': ['ci/cd', 'continuous integration', 'continuous deployment', 'devops'],
-        }
+        # Static tables are built once at import and shared by every instance
+        self.skill_synonyms = SKILL_SYNONYMS
+        self._synonym_canonical = _SYNONYM_CANONICAL
     
     def normalize_skill(self, skill: str) -> str:
         """Normalize skill name for better matching"""
-        skill = skill.lower().strip()
-        skill = re.sub(r'[^\w\s\+\#\.]', '', skill)  # Remove special chars except +, #, .
-        skill = re.sub(r'\s+', ' ', skill)  # Normalize whitespace
-        return skill
+        return _normalize_skill(skill)
     
     def find_skill_matches(self, resume_skills: List[str], job_skills: List[str]) -> Tuple[List[str], List[str]]:
         """Find matching and missing skills using fuzzy matching"""
-        normalized_resume = [self.normalize_skill(skill) for skill in resume_skills]
-        normalized_job = [self.normalize_skill(skill) for skill in job_skills]
+        return self._split_skill_matches(self._index_resume_skills(resume_skills), job_skills, {})
+    
+    def _index_resume_skills(self, resume_skills: List[str]) -> Tuple[Tuple[str, ...], FrozenSet[str], FrozenSet[str]]:
+        """Normalize resume skills once into (ordered tuple, set, canonical synonym set)"""
+        # The same resume is usually analyzed against many jobs, so the index is
+        # cached on the skills themselves rather than recomputed per analysis
+        return _index_skills(tuple(resume_skills))
+    
+    def _split_skill_matches(
+        self,
+        resume_index: Tuple[Tuple[str, ...], FrozenSet[str], FrozenSet[str]],
+        job_skills: List[str],
+        match_cache: Dict[str, bool]
+    ) -> Tuple[List[str], List[str]]:
+        """Split job skills into matching and missing against an indexed resume"""
+        normalized_resume, resume_set, resume_canonical = resume_index
+        
+        # Nothing can match an empty resume
+        if not normalized_resume:
+            return [], [self.normalize_skill(skill) for skill in job_skills]
         
         matching = []
         missing = []
         
-        for job_skill in normalized_job:
-            found_match = False
+        for job_skill in map(self.normalize_skill, job_skills):
+            found_match = match_cache.get(job_skill)
+            if found_match is None:
+                # Direct and synonym matches are set lookups; only the
+                # remaining skills need pairwise fuzzy comparison
+                found_match = (
+                    job_skill in resume_set
+                    or self._synonym_canonical.get(job_skill, job_skill) in resume_canonical
+                    or self._has_similar_skill(job_skill, normalized_resume)
+                )
+                match_cache[job_skill] = found_match
             
-            # Check direct matches
-            if job_skill in normalized_resume:
+            if found_match:
                 matching.append(job_skill)
-                found_match = True
             else:
-                # Check synonyms
-                for resume_skill in normalized_resume:
-                    if self.are_skills_similar(job_skill, resume_skill):
-                        matching.append(job_skill)
-                        found_match = True
-                        break
-            
-            if not found_match:
                 missing.append(job_skill)
         
         return matching, missing
     
+    def _has_similar_skill(self, job_skill: str, normalized_resume: Sequence[str], threshold: float = 0.8) -> bool:
+        """Fuzzy or containment match of a normalized job skill against all normalized resume skills"""
+        # One C-level scan over every resume skill instead of a ratio call per pair
+        if process.extractOne(job_skill, normalized_resume, scorer=fuzz.ratio, score_cutoff=threshold * 100):
+            return True
+        return any(job_skill in resume_skill or resume_skill in job_skill for resume_skill in normalized_resume)
+    
     def are_skills_similar(self, skill1: str, skill2: str, threshold: float = 0.8) -> bool:
         """Check if two skills are similar using various methods"""
         skill1 = self.normalize_skill(skill1)
@@ -113,15 +205,17 @@ class GapAnalyzerService:
             return True
         
         # Check synonyms
-        for canonical, synonyms in self.skill_synonyms.items():
-            if skill1 in synonyms and skill2 in synonyms:
-                return True
-        
-        # Fuzzy string matching
-        similarity = SequenceMatcher(None, skill1, skill2).ratio()
-        if similarity >= threshold:
+        canonical = self._synonym_canonical.get(skill1)
+        if canonical is not None and canonical == self._synonym_canonical.get(skill2):
             return True
         
+        # Fuzzy string matching, skipped when the length difference alone keeps
+        # the best possible ratio below the threshold
+        total_length = len(skill1) + len(skill2)
+        if 1 - abs(len(skill1) - len(skill2)) / total_length >= threshold:
+            if fuzz.ratio(skill1, skill2, score_cutoff=threshold * 100):
+                return True
+        
         # Check if one skill contains the other
         if skill1 in skill2 or skill2 in skill1:
             return True
@@ -130,58 +224,32 @@ class GapAnalyzerService:
     
     def extract_skills_from_resume(self, resume_data: Dict) -> List[str]:
         """Extract all skills from resume data"""
-        skills = []
+        parsed = resume_data.get('parsed_data')
+        if not parsed:
+            return []
         
-        # Get skills from parsed data
-        if resume_data.get('parsed_data'):
-            parsed = resume_data['parsed_data']
-            
-            # Programming languages
-            if parsed.get('programming_languages'):
-                skills.extend(parsed['programming_languages'])
-            
-            # Skills section
-            if parsed.get('skills'):
-                skills.extend(parsed['skills'])
-            
-            # Technologies from experience
-            if parsed.get('experience'):
-                for exp in parsed['experience']:
-                    content = exp.get('content', '')
-                    # Extract technology mentions from experience text
-                    tech_words = self.extract_technologies_from_text(content)
-                    skills.extend(tech_words)
-        
-        # Clean and deduplicate
-        cleaned_skills = []
-        for skill in skills:
-            if isinstance(skill, str) and skill.strip():
-                cleaned_skills.append(skill.strip())
-        
-        return list(set(cleaned_skills))
+        # Programming languages, skills section, then technologies from experience text
+        skills = chain(
+            parsed.get('programming_languages') or [],
+            parsed.get('skills') or [],
+            chain.from_iterable(
+                self.extract_technologies_from_text(exp.get('content', ''))
+                for exp in parsed.get('experience') or []
+            )
+        )
+        
+        # Clean and deduplicate in one ordered pass
+        return list(dict.fromkeys(
+            skill.strip() for skill in skills if isinstance(skill, str) and skill.strip()
+        ))
     
     def extract_technologies_from_text(self, text: str) -> List[str]:
         """Extract technology mentions from text"""
         if not text:
             return []
         
-        text = text.lower()
-        technologies = []
-        
-        # Common technologies to look for
-        tech_patterns = [
-            'python', 'javascript', 'java', 'typescript', 'php', 'ruby', 'go', 'rust',
-            'react', 'angular', 'vue', 'nodejs', 'express', 'django', 'flask', 'fastapi',
-            'postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'elasticsearch',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'jenkins',
-            'git', 'jira', 'confluence', 'slack', 'figma'
-        ]
-        
-        for tech in tech_patterns:
-            if tech in text:
-                technologies.append(tech)
-        
-        return technologies
+        found = find_whole_words(_TECH_AUTOMATON, text.lower())
+        return [tech for tech in TECH_KEYWORDS if tech in found]
     
     def calculate_experience_gap(self, resume_experience: Optional[int], job_requirements: Dict) -> Optional[int]:
         """Calculate experience gap in years"""
@@ -199,19 +267,8 @@ class GapAnalyzerService:
     
     def check_experience_level_match(self, resume_level: str, job_level: str) -> bool:
         """Check if experience levels match"""
-        level_hierarchy = {
-            'entry': 1,
-            'junior': 1,
-            'mid': 2,
-            'intermediate': 2,
-            'senior': 3,
-            'lead': 4,
-            'principal': 4,
-            'executive': 5
-        }
-        
-        resume_rank = level_hierarchy.get(resume_level.lower(), 1)
-        job_rank = level_hierarchy.get(job_level.lower(), 1)
+        resume_rank = self.LEVEL_RANKS.get(resume_level.lower(), 1)
+        job_rank = self.LEVEL_RANKS.get(job_level.lower(), 1)
         
         return resume_rank >= job_rank
     
@@ -261,97 +318,62 @@ class GapAnalyzerService:
     
     def calculate_priority_scores(self, gap_result: GapAnalysisResult) -> List[Dict[str, Any]]:
         """Calculate improvement priorities with scores"""
-        priorities = []
-        
-        # Missing required skills (highest priority)
-        for skill in gap_result.missing_required_skills:
-            priorities.append({
-                'category': 'Required Skill',
-                'item': skill,
-                'priority_score': 10,
-                'urgency': 'Critical'
-            })
-        
-        # Missing programming languages
-        for lang in gap_result.missing_languages:
-            priorities.append({
-                'category': 'Programming Language',
-                'item': lang,
-                'priority_score': 8,
-                'urgency': 'High'
-            })
-        
-        # Missing frameworks
-        for framework in gap_result.missing_frameworks:
-            priorities.append({
-                'category': 'Framework',
-                'item': framework,
-                'priority_score': 7,
-                'urgency': 'High'
-            })
-        
-        # Missing databases
-        for db in gap_result.missing_databases:
-            priorities.append({
-                'category': 'Database',
-                'item': db,
-                'priority_score': 6,
-                'urgency': 'Medium'
-            })
-        
-        # Missing cloud platforms
-        for cloud in gap_result.missing_cloud_platforms:
-            priorities.append({
-                'category': 'Cloud Platform',
-                'item': cloud,
-                'priority_score': 6,
-                'urgency': 'Medium'
-            })
-        
-        # Missing preferred skills
-        for skill in gap_result.missing_preferred_skills:
-            priorities.append({
-                'category': 'Preferred Skill',
-                'item': skill,
-                'priority_score': 4,
-                'urgency': 'Low'
-            })
+        priorities = [
+            {
+                'category': category,
+                'item': item,
+                'priority_score': priority_score,
+                'urgency': urgency
+            }
+            for category, attribute, priority_score, urgency in self.PRIORITY_TABLE
+            for item in getattr(gap_result, attribute)
+        ]
         
         # Sort by priority score
-        priorities.sort(key=lambda x: x['priority_score'], reverse=True)
+        priorities.sort(key=itemgetter('priority_score'), reverse=True)
         
         return priorities
     
     def analyze_gap(self, resume_data: Dict, job_requirements: Dict) -> GapAnalysisResult:
         """Main method to analyze gaps between resume and job requirements"""
         
-        # Extract skills from resume
+        # Without requirements there is nothing to match, score or recommend
+        if not job_requirements:
+            return GapAnalysisResult(
+                experience_level_match=self.check_experience_level_match('mid', 'entry')
+            )
+        
+        # Extract skills from resume and normalize them once for every category
         resume_skills = self.extract_skills_from_resume(resume_data)
+        resume_index = self._index_resume_skills(resume_skills)
+        
+        # Job skills repeat across categories, so each is matched once per analysis
+        match_cache = {}
         
         # Analyze skills gaps
-        matching_required, missing_required = self.find_skill_matches(
-            resume_skills, job_requirements.get('required_skills', [])
+        matching_required, missing_required = self._split_skill_matches(
+            resume_index, job_requirements.get('required_skills', []), match_cache
         )
         
-        matching_preferred, missing_preferred = self.find_skill_matches(
-            resume_skills, job_requirements.get('preferred_skills', [])
+        matching_preferred, missing_preferred = self._split_skill_matches(
+            resume_index, job_requirements.get('preferred_skills', []), match_cache
         )
         
         # Analyze technology gaps
-        matching_languages, missing_languages = self.find_skill_matches(
-            resume_skills, job_requirements.get('programming_languages', [])
+        matching_languages, missing_languages = self._split_skill_matches(
+            resume_index, job_requirements.get('programming_languages', []), match_cache
         )
         
-        matching_frameworks, missing_frameworks = self.find_skill_matches(
-            resume_skills, job_requirements.get('frameworks', [])
+        matching_frameworks, missing_frameworks = self._split_skill_matches(
+            resume_index, job_requirements.get('frameworks', []), match_cache
         )
         
-        matching_databases, missing_databases = self.find_skill_matches(
-            resume_skills, job_requirements.get('databases', [])
+        matching_databases, missing_databases = self._split_skill_matches(
+            resume_index, job_requirements.get('databases', []), match_cache
         )
         
-        matching_cloud, missing_cloud = self.find_skill_matches(
-            resume_skills, job_requirements.get('cloud_platforms', [])
+        matching_cloud, missing_cloud = self._split_skill_matches(
+            resume_index, job_requirements.get('cloud_platforms', []), match_cache
         )
         
         # Analyze experience gap
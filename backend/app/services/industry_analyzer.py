@@ -2,6 +2,7 @@
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from pydantic import BaseModel
+from app.services.keyword_matcher import build_automaton, find_keywords
 
 class IndustryType(str, Enum):
     """Supported industry types"""
@@ -34,12 +35,49 @@ class IndustryProfile(BaseModel):
     keyword_weights: Dict[str, float]
     achievement_focus: List[str]
 
+# Industry keyword patterns, all found with one scan of the text
+_INDUSTRY_KEYWORDS = {
+    IndustryType.TECHNOLOGY: [
+        "software", "programming", "developer", "engineer", "tech", "startup",
+        "cloud", "api", "database", "devops", "agile", "scrum"
+    ],
+    IndustryType.FINANCE: [
+        "finance", "financial", "banking", "investment", "trading", "risk",
+        "compliance", "audit", "portfolio", "capital", "regulatory"
+    ],
+    IndustryType.HEALTHCARE: [
+        "healthcare", "medical", "hospital", "clinical", "patient", "nurse",
+        "doctor", "physician", "health", "pharmaceutical", "biotech"
+    ],
+    IndustryType.CONSULTING: [
+        "consulting", "consultant", "advisory", "strategy", "transformation",
+        "implementation", "client", "stakeholder", "analysis"
+    ],
+    IndustryType.MARKETING: [
+        "marketing", "advertising", "brand", "campaign", "digital", "social media",
+        "content", "seo", "ppc", "analytics", "creative"
+    ]
+}
+_INDUSTRY_KEYWORD_AUTOMATON = build_automaton(
+    keyword for keywords in _INDUSTRY_KEYWORDS.values() for keyword in keywords
+)
+
 class IndustryAnalyzerService:
     """Service for industry-specific resume optimization"""
     
     def __init__(self):
         self.industry_profiles = self._load_industry_profiles()
         self.role_patterns = self._load_role_patterns()
+        
+        # Lowercased skill tiers per industry, ordered by weight
+        self.skill_tiers = {
+            industry: (
+                frozenset(s.lower() for s in profile.key_skills),
+                frozenset(s.lower() for s in profile.technical_skills),
+                frozenset(s.lower() for s in profile.soft_skills)
+            )
+            for industry, profile in self.industry_profiles.items()
+        }
     
     def _load_industry_profiles(self) -> Dict[IndustryType, IndustryProfile]:
         """Load comprehensive industry profiles"""
@@ -263,35 +301,11 @@ class IndustryAnalyzerService:
         
         text = f"{job_description} {company_info}".lower()
         
-        # Industry keyword patterns
-        industry_keywords = {
-            IndustryType.TECHNOLOGY: [
-                "software", "programming", "developer", "engineer", "tech", "startup",
-                "cloud", "api", "database", "devops", "agile", "scrum"
-            ],
-            IndustryType.FINANCE: [
-                "finance", "financial", "banking", "investment", "trading", "risk",
-                "compliance", "audit", "portfolio", "capital", "regulatory"
-            ],
-            IndustryType.HEALTHCARE: [
-                "healthcare", "medical", "hospital", "clinical", "patient", "nurse",
-                "doctor", "physician", "health", "pharmaceutical", "biotech"
-            ],
-            IndustryType.CONSULTING: [
-                "consulting", "consultant", "advisory", "strategy", "transformation",
-                "implementation", "client", "stakeholder", "analysis"
-            ],
-            IndustryType.MARKETING: [
-                "marketing", "advertising", "brand", "campaign", "digital", "social media",
-                "content", "seo", "ppc", "analytics", "creative"
-            ]
-        }
-        
         # Score each industry
+        found = find_keywords(_INDUSTRY_KEYWORD_AUTOMATON, text)
         industry_scores = {}
-        for industry, keywords in industry_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            industry_scores[industry] = score / len(keywords)
+        for industry, keywords in _INDUSTRY_KEYWORDS.items():
+            industry_scores[industry] = len(found.intersection(keywords)) / len(keywords)
         
         # Find best match
         best_industry = max(industry_scores, key=industry_scores.get)
@@ -310,7 +324,9 @@ class IndustryAnalyzerService:
     def calculate_skill_weights(self, skills: List[str], industry: IndustryType) -> Dict[str, float]:
         """Calculate weighted importance of skills for specific industry"""
         
-        profile = self.get_industry_profile(industry)
+        key_skills, technical_skills, soft_skills = self.skill_tiers.get(
+            industry, self.skill_tiers[IndustryType.GENERAL]
+        )
         skill_weights = {}
         
         for skill in skills:
@@ -318,11 +334,11 @@ class IndustryAnalyzerService:
             weight = 0.5  # Default weight
             
             # Check against industry-specific skills
-            if skill_lower in [s.lower() for s in profile.key_skills]:
+            if skill_lower in key_skills:
                 weight = 0.9
-            elif skill_lower in [s.lower() for s in profile.technical_skills]:
+            elif skill_lower in technical_skills:
                 weight = 0.8
-            elif skill_lower in [s.lower() for s in profile.soft_skills]:
+            elif skill_lower in soft_skills:
                 weight = 0.6
             
             skill_weights[skill] = weight
@@ -1,40 +1,283 @@
+import asyncio
+import copy
+import hashlib
 import re
-from typing import Dict, List, Optional
-from pydantic import BaseModel
-from openai import OpenAI
+from dataclasses import asdict, field
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple, Union
+import orjson
+import redis.asyncio as aioredis
+from pydantic.dataclasses import dataclass
+from openai import AsyncOpenAI
 import google.generativeai as genai
 from app.core.config import settings
+from app.services.keyword_matcher import build_automaton, find_keywords_and_whole_words
+from app.services.loop_clients import LoopBoundClient
 
-class JobRequirements(BaseModel):
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Irrelevant trailing sections. After whitespace collapsing the text is one
+# line, so everything from the earliest marker on is dropped in a single scan;
+# "submit" only counts as a marker when "resume" follows it
+_IRRELEVANT_SECTION_RE = re.compile(
+    r'apply now|(?P<submit>submit)|equal opportunity employer|we are an equal', re.IGNORECASE
+)
+_IRRELEVANT_PHRASE_RE = re.compile(r'apply now|equal opportunity employer|we are an equal', re.IGNORECASE)
+_RESUME_RE = re.compile(r'resume', re.IGNORECASE)
+
+# Years of experience, tried in order of specificity
+_EXPERIENCE_YEARS_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+        r'(\d+)\+?\s*years?\s*(?:in|with)',
+        r'minimum\s*(\d+)\s*years?',
+        r'(\d+)\+\s*years?'
+    )
+)
+
+# Experience level and work location terms; the groups are checked in priority
+# order, each as a frozenset intersected with the terms found in the text
+_SENIOR_TERMS = frozenset(('senior', 'sr.', 'lead', 'principal'))
+_MID_TERMS = frozenset(('mid-level', 'intermediate', '3+ years', '4+ years'))
+_ENTRY_TERMS = frozenset(('entry', 'junior', 'new grad', 'recent graduate'))
+_REMOTE_TERMS = frozenset(('remote', 'work from home', 'wfh'))
+_HYBRID_TERMS = frozenset(('hybrid', 'flexible'))
+_ONSITE_TERMS = frozenset(('on-site', 'onsite', 'office'))
+
+# Technology categories as (spellings, display name) in output order
+_PROGRAMMING_LANGUAGES = tuple(
+    ((lang,), lang.title())
+    for lang in (
+        'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+        'typescript', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql'
+    )
+)
+_FRAMEWORKS = tuple(
+    ((framework, framework.replace('js', '.js')), framework.title())
+    for framework in (
+        'react', 'angular', 'vue', 'nodejs', 'express', 'django', 'flask',
+        'spring', 'rails', 'laravel', 'fastapi', 'nextjs', 'nuxt'
+    )
+)
+_DATABASES = tuple(
+    ((db,), db.title())
+    for db in (
+        'postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'oracle',
+        'cassandra', 'elasticsearch', 'dynamodb'
+    )
+)
+_CLOUD_PLATFORMS = tuple(
+    ((platform,), platform.upper() if platform in ('aws', 'gcp') else platform.title())
+    for platform in ('aws', 'azure', 'gcp', 'google cloud', 'heroku', 'digitalocean')
+)
+_TOOLS = tuple(
+    ((tool,), tool.title())
+    for tool in (
+        'git', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible',
+        'jira', 'confluence', 'slack', 'figma', 'postman'
+    )
+)
+
+# Every term and technology in one automaton, so a job description is scanned
+# once. Experience and location terms match anywhere (e.g. "4+ years");
+# technologies only as whole words, so "go" isn't found in "good" nor "r" in every text
+_KEYWORD_AUTOMATON = build_automaton(chain(
+    _SENIOR_TERMS, _MID_TERMS, _ENTRY_TERMS, _REMOTE_TERMS, _HYBRID_TERMS, _ONSITE_TERMS,
+    chain.from_iterable(
+        spellings
+        for category in (_PROGRAMMING_LANGUAGES, _FRAMEWORKS, _DATABASES, _CLOUD_PLATFORMS, _TOOLS)
+        for spellings, _ in category
+    )
+))
+
+
+def _matched_category(category: Tuple[Tuple[Tuple[str, ...], str], ...], found: Set[str]) -> List[str]:
+    """Display names of the category entries with any spelling among the found keywords"""
+    return [display for spellings, display in category if not found.isdisjoint(spellings)]
+
+
+# JSON structure requested from the AI providers, shared by the single and batch prompts
+_REQUIREMENTS_JSON_STRUCTURE = """        {
+            "required_skills": ["skill1", "skill2", ...],
+            "preferred_skills": ["skill1", "skill2", ...],
+            "required_experience_years": number or null,
+            "experience_level": "entry|mid|senior|executive",
+            "technologies": ["tech1", "tech2", ...],
+            "programming_languages": ["lang1", "lang2", ...],
+            "frameworks": ["framework1", "framework2", ...],
+            "databases": ["db1", "db2", ...],
+            "cloud_platforms": ["platform1", "platform2", ...],
+            "tools": ["tool1", "tool2", ...],
+            "certifications": ["cert1", "cert2", ...],
+            "education_requirements": ["requirement1", "requirement2", ...],
+            "responsibilities": ["responsibility1", "responsibility2", ...],
+            "company_size": "startup|small|medium|large|enterprise" or null,
+            "industry": "industry name" or null,
+            "work_location": "remote|hybrid|onsite" or null,
+            "salary_range": "salary range" or null
+        }
+"""
+
+_EXTRACTION_FOCUS = """        Focus on extracting:
+        1. Technical skills (required vs preferred)
+        2. Programming languages and frameworks
+        3. Years of experience and seniority level
+        4. Education requirements
+        5. Key responsibilities
+        6. Company and role context
+
+"""
+
+
+def _build_analysis_prompt(job_description: str) -> str:
+    """Prompt asking an AI provider for the job requirements as JSON"""
+    return f"""
+        Analyze the following job description and extract structured information. Return the data in JSON format with the following structure:
+
+{_REQUIREMENTS_JSON_STRUCTURE}
+{_EXTRACTION_FOCUS}        Job Description:
+        {job_description}
+        """
+
+
+def _build_batch_analysis_prompt(job_descriptions: List[str]) -> str:
+    """Prompt asking an AI provider for the requirements of several job descriptions in one JSON object"""
+    sections = "\n\n".join(
+        f"<<JD {index}>>\n{job_description}" for index, job_description in enumerate(job_descriptions)
+    )
+    return f"""
+        Analyze each of the following {len(job_descriptions)} job descriptions and extract structured information. Return a JSON object of the form {{"analyses": [...]}} with exactly one entry per job description, in the order given, each with the following structure:
+
+{_REQUIREMENTS_JSON_STRUCTURE}
+{_EXTRACTION_FOCUS}        Job Descriptions:
+        {sections}
+        """
+
+
+_ANALYSIS_SYSTEM_PROMPT = "You are an expert at analyzing job descriptions and extracting structured requirements data. Always return valid JSON."
+
+
+def _openai_analysis_request(job_description: str) -> Dict:
+    """Chat completion arguments for analyzing one job description with OpenAI"""
+    return {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": _ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": _build_analysis_prompt(job_description)}
+        ],
+        "temperature": 0.1,
+        "max_tokens": 2000
+    }
+
+
+@dataclass(slots=True)
+class JobRequirements:
     """Structured job requirements data model"""
-    required_skills: List[str] = []
-    preferred_skills: List[str] = []
+    required_skills: List[str] = field(default_factory=list)
+    preferred_skills: List[str] = field(default_factory=list)
     required_experience_years: Optional[int] = None
     experience_level: str = "entry"  # entry, mid, senior, executive
-    technologies: List[str] = []
-    programming_languages: List[str] = []
-    frameworks: List[str] = []
-    databases: List[str] = []
-    cloud_platforms: List[str] = []
-    tools: List[str] = []
-    certifications: List[str] = []
-    education_requirements: List[str] = []
-    responsibilities: List[str] = []
+    technologies: List[str] = field(default_factory=list)
+    programming_languages: List[str] = field(default_factory=list)
+    frameworks: List[str] = field(default_factory=list)
+    databases: List[str] = field(default_factory=list)
+    cloud_platforms: List[str] = field(default_factory=list)
+    tools: List[str] = field(default_factory=list)
+    certifications: List[str] = field(default_factory=list)
+    education_requirements: List[str] = field(default_factory=list)
+    responsibilities: List[str] = field(default_factory=list)
     company_size: Optional[str] = None
     industry: Optional[str] = None
     work_location: Optional[str] = None  # remote, hybrid, onsite
     salary_range: Optional[str] = None
 
+
+def _parse_requirements_json(result_text: str) -> JobRequirements:
+    """Parse an AI response into JobRequirements, dropping any markdown code fence"""
+    result_text = result_text.strip()
+    if result_text.startswith('```json'):
+        result_text = result_text[7:]
+    if result_text.endswith('```'):
+        result_text = result_text[:-3]
+    
+    # orjson + the dataclass constructor benchmarks faster here than pydantic's
+    # single-pass TypeAdapter.validate_json, and keeps JSONDecodeError for bad output
+    return JobRequirements(**orjson.loads(result_text))
+
+# Analyses keyed by a digest of the cleaned description and the enabled providers
+JOB_ANALYSIS_CACHE_SIZE = 256
+_JOB_ANALYSIS_CACHE: Dict[Tuple[bytes, bool, bool], JobRequirements] = {}
+
+# AI analyses shared across workers and restarts through Redis
+REDIS_ANALYSIS_TTL_SECONDS = 24 * 60 * 60
+REDIS_ANALYSIS_KEY_PREFIX = "job_analysis:"
+
+
+@lru_cache(maxsize=1)
+def _shared_redis_clients() -> Optional[LoopBoundClient[aioredis.Redis]]:
+    """Redis clients (and connection pools) shared by every service instance, one per event
+    loop since pooled connections can't be used from another loop; None without a Redis URL"""
+    if not settings.REDIS_URL:
+        return None
+    return LoopBoundClient(
+        lambda: aioredis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1),
+        close=lambda client: client.aclose()
+    )
+
+
+async def close_shared_redis_client():
+    """Close the shared Redis client opened in the running event loop, e.g. on app shutdown"""
+    redis_clients = _shared_redis_clients()
+    if redis_clients:
+        await redis_clients.aclose()
+
+# Concurrent analyses per batch, keeping bulk runs within provider rate limits
+BATCH_ANALYSIS_MAX_CONCURRENCY = 8
+
+# Job descriptions sent together in one prompt-batched OpenAI call
+SINGLE_CALL_BATCH_SIZE = 8
+
+# OpenAI Batch API jobs for offline bulk analysis (cheaper, completed within 24h)
+BATCH_API_POLL_INTERVAL_SECONDS = 30.0
+_BATCH_API_FAILED_STATUSES = ('failed', 'expired', 'cancelled')
+
+# List fields deduplicated by validate_requirements
+_DEDUPLICATED_FIELDS = (
+    'required_skills', 'preferred_skills', 'technologies', 'programming_languages',
+    'frameworks', 'databases', 'cloud_platforms', 'tools'
+)
+
+_EXPERIENCE_LEVELS = frozenset(("entry", "mid", "senior", "executive"))
+
+# Confidence weights for fields that count when non-empty; a non-entry
+# experience level adds its own weight
+_CONFIDENCE_FIELD_WEIGHTS = (
+    ('required_skills', 1.0),
+    ('programming_languages', 1.0),
+    ('required_experience_years', 1.0),
+    ('technologies', 1.0),
+    ('frameworks', 1.0),
+    ('responsibilities', 2.0),
+    ('education_requirements', 1.0),
+    ('work_location', 1.0)
+)
+_CONFIDENCE_EXPERIENCE_LEVEL_WEIGHT = 1.0
+_CONFIDENCE_MAX_SCORE = 10.0
+
 class JobAnalyzerService:
     """Service for analyzing job descriptions and extracting requirements"""
     
-    def __init__(self):
-        # Initialize OpenAI
+    def __init__(self, race_providers: bool = False):
+        # Initialize OpenAI, one client per event loop since each sync call runs its own
         if settings.OPENAI_API_KEY:
-            self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            self._openai_clients = LoopBoundClient(
+                lambda: AsyncOpenAI(api_key=settings.OPENAI_API_KEY), close=lambda client: client.close()
+            )
             self.openai_enabled = True
         else:
-            self.openai_client = None
+            self._openai_clients = None
             self.openai_enabled = False
         
         # Initialize Gemini
@@ -45,22 +288,62 @@ class JobAnalyzerService:
         else:
             self.gemini_model = None
             self.gemini_enabled = False
+        
+        self._redis_clients = _shared_redis_clients()
+        
+        # Racing cuts latency to the fastest provider but pays for both calls;
+        # without it, Gemini is only asked once OpenAI has failed
+        self.race_providers = race_providers
+    
+    @property
+    def openai_client(self) -> Optional[AsyncOpenAI]:
+        """OpenAI client for the running event loop, None without an API key"""
+        return self._openai_clients.get() if self._openai_clients else None
+    
+    @openai_client.setter
+    def openai_client(self, client: Optional[AsyncOpenAI]):
+        """Use the given client (e.g. a stub) in every event loop; it's left open by aclose()"""
+        self._openai_clients = None if client is None else LoopBoundClient(lambda: client)
+    
+    @property
+    def redis_client(self) -> Optional[aioredis.Redis]:
+        """Shared Redis client for the running event loop, None without a Redis URL"""
+        return self._redis_clients.get() if self._redis_clients else None
+    
+    @redis_client.setter
+    def redis_client(self, client: Optional[aioredis.Redis]):
+        """Use the given client (e.g. a stub) in every event loop, or None to skip the shared cache"""
+        self._redis_clients = None if client is None else LoopBoundClient(lambda: client)
+    
+    async def aclose(self):
+        """Close the OpenAI client built for the running event loop"""
+        if self._openai_clients:
+            await self._openai_clients.aclose()
+    
+    def _run_sync(self, coroutine):
+        """Run a coroutine in a fresh event loop, closing the clients opened in it"""
+        async def run_and_close():
+            try:
+                return await coroutine
+            finally:
+                await self.aclose()
+                if self._redis_clients:
+                    await self._redis_clients.aclose()
+        
+        return asyncio.run(run_and_close())
     
     def clean_job_description(self, job_description: str) -> str:
         """Clean and normalize job description text"""
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', job_description.strip())
+        cleaned = _WHITESPACE_RE.sub(' ', job_description.strip())
         
         # Remove common irrelevant sections
-        patterns_to_remove = [
-            r'apply now.*?$',
-            r'submit.*?resume.*?$',
-            r'equal opportunity employer.*?$',
-            r'we are an equal.*?$'
-        ]
-        
-        for pattern in patterns_to_remove:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.MULTILINE)
+        match = _IRRELEVANT_SECTION_RE.search(cleaned)
+        if match and match.lastgroup == 'submit' and not _RESUME_RE.search(cleaned, match.end()):
+            # No later "submit" can have a "resume" after it either
+            match = _IRRELEVANT_PHRASE_RE.search(cleaned, match.end())
+        if match:
+            cleaned = cleaned[:match.start()]
         
         return cleaned.strip()
     
@@ -69,224 +352,118 @@ class JobAnalyzerService:
         requirements = JobRequirements()
         text = job_description.lower()
         
+        found, technologies = find_keywords_and_whole_words(_KEYWORD_AUTOMATON, text)
+        
         # Extract experience level
-        if any(term in text for term in ['senior', 'sr.', 'lead', 'principal']):
+        if not found.isdisjoint(_SENIOR_TERMS):
             requirements.experience_level = "senior"
-        elif any(term in text for term in ['mid-level', 'intermediate', '3+ years', '4+ years']):
+        elif not found.isdisjoint(_MID_TERMS):
             requirements.experience_level = "mid"
-        elif any(term in text for term in ['entry', 'junior', 'new grad', 'recent graduate']):
+        elif not found.isdisjoint(_ENTRY_TERMS):
             requirements.experience_level = "entry"
         
         # Extract years of experience
-        exp_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*(?:in|with)',
-            r'minimum\s*(\d+)\s*years?',
-            r'(\d+)\+\s*years?'
-        ]
-        for pattern in exp_patterns:
-            match = re.search(pattern, text)
+        for pattern in _EXPERIENCE_YEARS_PATTERNS:
+            match = pattern.search(text)
             if match:
                 requirements.required_experience_years = int(match.group(1))
                 break
         
-        # Extract programming languages
-        prog_languages = [
-            'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'typescript', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql'
-        ]
-        for lang in prog_languages:
-            if lang in text:
-                requirements.programming_languages.append(lang.title())
-        
-        # Extract frameworks
-        frameworks = [
-            'react', 'angular', 'vue', 'nodejs', 'express', 'django', 'flask',
-            'spring', 'rails', 'laravel', 'fastapi', 'nextjs', 'nuxt'
-        ]
-        for framework in frameworks:
-            if framework in text or framework.replace('js', '.js') in text:
-                requirements.frameworks.append(framework.title())
-        
-        # Extract databases
-        databases = [
-            'postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'oracle',
-            'cassandra', 'elasticsearch', 'dynamodb'
-        ]
-        for db in databases:
-            if db in text:
-                requirements.databases.append(db.title())
-        
-        # Extract cloud platforms
-        cloud_platforms = ['aws', 'azure', 'gcp', 'google cloud', 'heroku', 'digitalocean']
-        for platform in cloud_platforms:
-            if platform in text:
-                requirements.cloud_platforms.append(platform.upper() if platform in ['aws', 'gcp'] else platform.title())
-        
-        # Extract tools
-        tools = [
-            'git', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible',
-            'jira', 'confluence', 'slack', 'figma', 'postman'
-        ]
-        for tool in tools:
-            if tool in text:
-                requirements.tools.append(tool.title())
+        # Extract technologies by category
+        requirements.programming_languages = _matched_category(_PROGRAMMING_LANGUAGES, technologies)
+        requirements.frameworks = _matched_category(_FRAMEWORKS, technologies)
+        requirements.databases = _matched_category(_DATABASES, technologies)
+        requirements.cloud_platforms = _matched_category(_CLOUD_PLATFORMS, technologies)
+        requirements.tools = _matched_category(_TOOLS, technologies)
         
         # Extract work location
-        if any(term in text for term in ['remote', 'work from home', 'wfh']):
+        if not found.isdisjoint(_REMOTE_TERMS):
             requirements.work_location = "remote"
-        elif any(term in text for term in ['hybrid', 'flexible']):
+        elif not found.isdisjoint(_HYBRID_TERMS):
             requirements.work_location = "hybrid"
-        elif any(term in text for term in ['on-site', 'onsite', 'office']):
+        elif not found.isdisjoint(_ONSITE_TERMS):
             requirements.work_location = "onsite"
         
         return requirements
     
     def analyze_with_openai(self, job_description: str) -> JobRequirements:
+        """Synchronous wrapper around analyze_with_openai_async"""
+        return self._run_sync(self.analyze_with_openai_async(job_description))
+    
+    async def analyze_with_openai_async(self, job_description: str) -> JobRequirements:
         """Analyze job description using OpenAI API"""
         if not self.openai_enabled:
             raise ValueError("OpenAI API key not configured")
         
-        prompt = f"""
-        Analyze the following job description and extract structured information. Return the data in JSON format with the following structure:
-
-        {{
-            "required_skills": ["skill1", "skill2", ...],
-            "preferred_skills": ["skill1", "skill2", ...],
-            "required_experience_years": number or null,
-            "experience_level": "entry|mid|senior|executive",
-            "technologies": ["tech1", "tech2", ...],
-            "programming_languages": ["lang1", "lang2", ...],
-            "frameworks": ["framework1", "framework2", ...],
-            "databases": ["db1", "db2", ...],
-            "cloud_platforms": ["platform1", "platform2", ...],
-            "tools": ["tool1", "tool2", ...],
-            "certifications": ["cert1", "cert2", ...],
-            "education_requirements": ["requirement1", "requirement2", ...],
-            "responsibilities": ["responsibility1", "responsibility2", ...],
-            "company_size": "startup|small|medium|large|enterprise" or null,
-            "industry": "industry name" or null,
-            "work_location": "remote|hybrid|onsite" or null,
-            "salary_range": "salary range" or null
-        }}
-
-        Focus on extracting:
-        1. Technical skills (required vs preferred)
-        2. Programming languages and frameworks
-        3. Years of experience and seniority level
-        4. Education requirements
-        5. Key responsibilities
-        6. Company and role context
-
-        Job Description:
-        {job_description}
-        """
-        
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert at analyzing job descriptions and extracting structured requirements data. Always return valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            # Parse the JSON response
-            import json
-            result_text = response.choices[0].message.content.strip()
-            
-            # Remove any markdown formatting
-            if result_text.startswith('```json'):
-                result_text = result_text[7:]
-            if result_text.endswith('```'):
-                result_text = result_text[:-3]
-            
-            result_data = json.loads(result_text)
-            return JobRequirements(**result_data)
+            response = await self.openai_client.chat.completions.create(**_openai_analysis_request(job_description))
+            return _parse_requirements_json(response.choices[0].message.content)
             
         except Exception as e:
             print(f"OpenAI analysis failed: {e}")
             raise e  # Re-raise to trigger Gemini fallback
     
     def analyze_with_gemini(self, job_description: str) -> JobRequirements:
+        """Synchronous wrapper around analyze_with_gemini_async"""
+        return self._run_sync(self.analyze_with_gemini_async(job_description))
+    
+    async def analyze_with_gemini_async(self, job_description: str) -> JobRequirements:
         """Analyze job description using Gemini API"""
         if not self.gemini_enabled:
             raise ValueError("Gemini API key not configured")
         
-        prompt = f"""
-        Analyze the following job description and extract structured information. Return the data in JSON format with the following structure:
-
-        {{
-            "required_skills": ["skill1", "skill2", ...],
-            "preferred_skills": ["skill1", "skill2", ...],
-            "required_experience_years": number or null,
-            "experience_level": "entry|mid|senior|executive",
-            "technologies": ["tech1", "tech2", ...],
-            "programming_languages": ["lang1", "lang2", ...],
-            "frameworks": ["framework1", "framework2", ...],
-            "databases": ["db1", "db2", ...],
-            "cloud_platforms": ["platform1", "platform2", ...],
-            "tools": ["tool1", "tool2", ...],
-            "certifications": ["cert1", "cert2", ...],
-            "education_requirements": ["requirement1", "requirement2", ...],
-            "responsibilities": ["responsibility1", "responsibility2", ...],
-            "company_size": "startup|small|medium|large|enterprise" or null,
-            "industry": "industry name" or null,
-            "work_location": "remote|hybrid|onsite" or null,
-            "salary_range": "salary range" or null
-        }}
-
-        Focus on extracting:
-        1. Technical skills (required vs preferred)
-        2. Programming languages and frameworks
-        3. Years of experience and seniority level
-        4. Education requirements
-        5. Key responsibilities
-        6. Company and role context
-
-        Job Description:
-        {job_description}
-        """
+        prompt = _build_analysis_prompt(job_description)
         
         try:
-            response = self.gemini_model.generate_content(prompt)
-            
-            # Parse the JSON response
-            import json
-            result_text = response.text.strip()
+            response = await self.gemini_model.generate_content_async(prompt)
             
             # Clean any Unicode characters that might cause issues
-            result_text = result_text.encode('ascii', 'ignore').decode('ascii')
-            
-            # Remove any markdown formatting
-            if result_text.startswith('```json'):
-                result_text = result_text[7:]
-            if result_text.endswith('```'):
-                result_text = result_text[:-3]
-            
-            result_data = json.loads(result_text)
-            return JobRequirements(**result_data)
+            result_text = response.text.encode('ascii', 'ignore').decode('ascii')
+            return _parse_requirements_json(result_text)
             
         except Exception as e:
             print(f"Gemini analysis failed: {e}")
             raise e  # Re-raise to trigger rule-based fallback
     
+    async def _analyze_with_ai(self, job_description: str) -> Optional[JobRequirements]:
+        """Return the first successful analysis from the enabled AI providers, or None"""
+        providers = []
+        if self.openai_enabled:
+            providers.append(self.analyze_with_openai_async)
+        if self.gemini_enabled:
+            providers.append(self.analyze_with_gemini_async)
+        
+        if not self.race_providers:
+            for analyze in providers:
+                try:
+                    return await analyze(job_description)
+                except Exception:
+                    continue
+            return None
+        
+        tasks = [asyncio.ensure_future(analyze(job_description)) for analyze in providers]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Walk in provider order so OpenAI wins when both finish together
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        return task.result()
+            return None
+        finally:
+            # The slower provider's answer is no longer needed
+            for task in pending:
+                task.cancel()
+    
     def validate_requirements(self, requirements: JobRequirements) -> JobRequirements:
         """Validate and clean extracted requirements"""
-        # Remove duplicates
-        requirements.required_skills = list(set(requirements.required_skills))
-        requirements.preferred_skills = list(set(requirements.preferred_skills))
-        requirements.technologies = list(set(requirements.technologies))
-        requirements.programming_languages = list(set(requirements.programming_languages))
-        requirements.frameworks = list(set(requirements.frameworks))
-        requirements.databases = list(set(requirements.databases))
-        requirements.cloud_platforms = list(set(requirements.cloud_platforms))
-        requirements.tools = list(set(requirements.tools))
+        # Remove duplicates, keeping the order the analysis reported them in
+        for field_name in _DEDUPLICATED_FIELDS:
+            setattr(requirements, field_name, list(dict.fromkeys(getattr(requirements, field_name))))
         
         # Validate experience level
-        if requirements.experience_level not in ["entry", "mid", "senior", "executive"]:
+        if requirements.experience_level not in _EXPERIENCE_LEVELS:
             requirements.experience_level = "entry"
         
         # Validate experience years
@@ -295,7 +472,33 @@ class JobAnalyzerService:
         
         return requirements
     
+    async def _analyze_with_shared_cache(self, job_description: str, digest: bytes) -> Optional[JobRequirements]:
+        """AI analysis backed by the Redis cache, so duplicate postings skip the LLM across processes"""
+        if self._redis_clients is None or not (self.openai_enabled or self.gemini_enabled):
+            return await self._analyze_with_ai(job_description)
+        
+        redis_key = REDIS_ANALYSIS_KEY_PREFIX + digest.hex()
+        try:
+            cached = await self.redis_client.get(redis_key)
+            if cached is not None:
+                return JobRequirements(**orjson.loads(cached))
+        except Exception as e:
+            # The shared cache is best-effort; analysis proceeds without it
+            print(f"Redis analysis cache lookup failed: {e}")
+        
+        requirements = await self._analyze_with_ai(job_description)
+        if requirements is not None:
+            try:
+                await self.redis_client.setex(redis_key, REDIS_ANALYSIS_TTL_SECONDS, orjson.dumps(asdict(requirements)))
+            except Exception as e:
+                print(f"Redis analysis cache write failed: {e}")
+        return requirements
+    
     def analyze_job_description(self, job_description: str) -> JobRequirements:
+        """Synchronous wrapper around analyze_job_description_async for callers without an event loop"""
+        return self._run_sync(self.analyze_job_description_async(job_description))
+    
+    async def analyze_job_description_async(self, job_description: str) -> JobRequirements:
         """Main method to analyze job description and return structured requirements"""
         if not job_description or not job_description.strip():
             raise ValueError("Job description cannot be empty")
@@ -303,62 +506,149 @@ class JobAnalyzerService:
         # Clean the job description
         cleaned_description = self.clean_job_description(job_description)
         
-        # Try AI analysis with fallback chain: OpenAI -> Gemini -> Rule-based
-        try:
-            if self.openai_enabled:
-                print("Attempting OpenAI analysis...")
-                requirements = self.analyze_with_openai(cleaned_description)
-                print("SUCCESS: OpenAI analysis successful")
-            elif self.gemini_enabled:
-                print("Attempting Gemini analysis...")
-                requirements = self.analyze_with_gemini(cleaned_description)
-                print("SUCCESS: Gemini analysis successful")
+        # Identical postings reuse the earlier analysis instead of another LLM call
+        cache_key = (
+            hashlib.blake2b(cleaned_description.encode(), digest_size=16).digest(),
+            self.openai_enabled,
+            self.gemini_enabled
+        )
+        cached = _JOB_ANALYSIS_CACHE.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        # Race the AI providers, falling back to rule-based parsing when none succeeds
+        requirements = await self._analyze_with_shared_cache(cleaned_description, cache_key[0])
+        if requirements is None:
+            if self.openai_enabled or self.gemini_enabled:
+                print("AI analysis failed, falling back to rule-based analysis...")
+                cache_key = None  # Don't pin a degraded result after provider errors
             else:
                 print("Using rule-based analysis...")
-                requirements = self.extract_basic_requirements(cleaned_description)
-        except Exception as openai_error:
-            print(f"OpenAI failed: {openai_error}")
-            try:
-                if self.gemini_enabled:
-                    print("Falling back to Gemini analysis...")
-                    requirements = self.analyze_with_gemini(cleaned_description)
-                    print("SUCCESS: Gemini fallback successful")
-                else:
-                    print("Falling back to rule-based analysis...")
-                    requirements = self.extract_basic_requirements(cleaned_description)
-            except Exception as gemini_error:
-                print(f"Gemini failed: {gemini_error}")
-                print("Using rule-based analysis as final fallback...")
-                requirements = self.extract_basic_requirements(cleaned_description)
+            requirements = self.extract_basic_requirements(cleaned_description)
         
         # Validate and clean results
         requirements = self.validate_requirements(requirements)
         
+        if cache_key is not None:
+            if len(_JOB_ANALYSIS_CACHE) >= JOB_ANALYSIS_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _JOB_ANALYSIS_CACHE[next(iter(_JOB_ANALYSIS_CACHE))]
+            _JOB_ANALYSIS_CACHE[cache_key] = copy.deepcopy(requirements)
+        
         return requirements
     
+    async def analyze_many(
+        self,
+        job_descriptions: List[str],
+        max_concurrency: int = BATCH_ANALYSIS_MAX_CONCURRENCY
+    ) -> List[Union[JobRequirements, Exception]]:
+        """Analyze several job descriptions concurrently, returning results (or errors) in input order"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_one(job_description: str) -> JobRequirements:
+            async with semaphore:
+                return await self.analyze_job_description_async(job_description)
+        
+        return await asyncio.gather(
+            *(analyze_one(job_description) for job_description in job_descriptions),
+            return_exceptions=True
+        )
+    
+    async def analyze_batch_single_call(self, job_descriptions: List[str]) -> List[JobRequirements]:
+        """Analyze several job descriptions with one OpenAI call per chunk, returning results in input order"""
+        if not self.openai_enabled:
+            raise ValueError("OpenAI API key not configured")
+        
+        cleaned_descriptions = [self.clean_job_description(job_description) for job_description in job_descriptions]
+        chunks = [
+            cleaned_descriptions[start:start + SINGLE_CALL_BATCH_SIZE]
+            for start in range(0, len(cleaned_descriptions), SINGLE_CALL_BATCH_SIZE)
+        ]
+        chunk_results = await asyncio.gather(*(self._analyze_chunk_single_call(chunk) for chunk in chunks))
+        return [requirements for chunk_result in chunk_results for requirements in chunk_result]
+    
+    async def _analyze_chunk_single_call(self, job_descriptions: List[str]) -> List[JobRequirements]:
+        """Send one prompt covering every job description and map the returned array back in order"""
+        response = await self.openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": _ANALYSIS_SYSTEM_PROMPT},
+                {"role": "user", "content": _build_batch_analysis_prompt(job_descriptions)}
+            ],
+            temperature=0.1,
+            max_tokens=2000 * len(job_descriptions),
+            # JSON mode only returns objects, so the array is wrapped in "analyses"
+            response_format={"type": "json_object"}
+        )
+        
+        analyses = orjson.loads(response.choices[0].message.content)["analyses"]
+        if len(analyses) != len(job_descriptions):
+            raise ValueError(f"Expected {len(job_descriptions)} analyses, got {len(analyses)}")
+        
+        return [self.validate_requirements(JobRequirements(**result_data)) for result_data in analyses]
+    
+    async def submit_batch(self, job_descriptions: List[str]) -> str:
+        """Submit job descriptions as an OpenAI Batch API job and return the batch id"""
+        if not self.openai_enabled:
+            raise ValueError("OpenAI API key not configured")
+        
+        # One chat completion request per line, keyed by the input position
+        batch_input = b"\n".join(
+            orjson.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _openai_analysis_request(self.clean_job_description(job_description))
+            })
+            for index, job_description in enumerate(job_descriptions)
+        )
+        
+        input_file = await self.openai_client.files.create(
+            file=("job_analyses.jsonl", batch_input),
+            purpose="batch"
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    async def collect_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = BATCH_API_POLL_INTERVAL_SECONDS
+    ) -> Dict[int, JobRequirements]:
+        """Wait for a submitted batch and return its analyses keyed by input position (failed items are omitted)"""
+        batch = await self.openai_client.batches.retrieve(batch_id)
+        while batch.status != 'completed':
+            if batch.status in _BATCH_API_FAILED_STATUSES:
+                raise RuntimeError(f"OpenAI batch {batch_id} {batch.status}")
+            await asyncio.sleep(poll_interval)
+            batch = await self.openai_client.batches.retrieve(batch_id)
+        
+        output = await self.openai_client.files.content(batch.output_file_id)
+        
+        results = {}
+        for line in output.text.splitlines():
+            record = orjson.loads(line)
+            response = record.get("response")
+            if not response or response.get("status_code") != 200:
+                continue
+            try:
+                requirements = _parse_requirements_json(response["body"]["choices"][0]["message"]["content"])
+            except Exception as e:
+                print(f"Batch analysis {record['custom_id']} failed: {e}")
+                continue
+            results[int(record["custom_id"])] = self.validate_requirements(requirements)
+        
+        return results
+    
     def get_confidence_score(self, requirements: JobRequirements) -> float:
         """Calculate confidence score for extracted requirements"""
-        score = 0.0
-        max_score = 10.0
-        
         # Score based on completeness
-        if requirements.required_skills:
-            score += 1.0
-        if requirements.programming_languages:
-            score += 1.0
+        score = sum(weight for field_name, weight in _CONFIDENCE_FIELD_WEIGHTS if getattr(requirements, field_name))
         if requirements.experience_level != "entry":
-            score += 1.0
-        if requirements.required_experience_years:
-            score += 1.0
-        if requirements.technologies:
-            score += 1.0
-        if requirements.frameworks:
-            score += 1.0
-        if requirements.responsibilities:
-            score += 2.0
-        if requirements.education_requirements:
-            score += 1.0
-        if requirements.work_location:
-            score += 1.0
-        
-        return min(score / max_score, 1.0)
\ No newline at end of file
+            score += _CONFIDENCE_EXPERIENCE_LEVEL_WEIGHT
+        
+        return min(score / _CONFIDENCE_MAX_SCORE, 1.0)
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""Multi-keyword substring matching backed by an Aho-Corasick automaton"""
+from functools import lru_cache
+from typing import Iterable, Set, Tuple
+
+import ahocorasick
+
+
+def build_automaton(keywords: Iterable[str]) -> ahocorasick.Automaton:
+    """Build an automaton reporting every lowercased keyword found in a text"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+        if keyword_lower:
+            automaton.add_word(keyword_lower, keyword_lower)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=256)
+def get_keyword_automaton(keywords: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """Build (or reuse) the automaton for a hashable keyword tuple"""
+    return build_automaton(keywords)
+
+
+def find_keywords(automaton: ahocorasick.Automaton, text: str) -> Set[str]:
+    """Return the lowercased keywords occurring anywhere in an already lowercased text"""
+    if len(automaton) == 0:
+        return set()
+    return {keyword for _, keyword in automaton.iter(text)}
+
+
+def contains_any(automaton: ahocorasick.Automaton, text: str) -> bool:
+    """Check whether any keyword occurs in an already lowercased text"""
+    if len(automaton) == 0:
+        return False
+    return next(automaton.iter(text), None) is not None
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end + 1] isn't part of a longer word"""
+    return (start == 0 or not _is_word_char(text[start - 1])) and \
+        (end == len(text) - 1 or not _is_word_char(text[end + 1]))
+
+
+def find_whole_words(automaton: ahocorasick.Automaton, text: str) -> Set[str]:
+    """Return the lowercased keywords occurring as whole words in an already lowercased text"""
+    if len(automaton) == 0:
+        return set()
+    
+    return {
+        keyword for end, keyword in automaton.iter(text)
+        if _is_whole_word(text, end - len(keyword) + 1, end)
+    }
+
+
+def find_keywords_and_whole_words(automaton: ahocorasick.Automaton, text: str) -> Tuple[Set[str], Set[str]]:
+    """Return (keywords found anywhere, keywords found as whole words) from one scan of an already lowercased text"""
+    found = set()
+    whole_words = set()
+    if len(automaton) == 0:
+        return found, whole_words
+    
+    for end, keyword in automaton.iter(text):
+        found.add(keyword)
+        if _is_whole_word(text, end - len(keyword) + 1, end):
+            whole_words.add(keyword)
+    return found, whole_words
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.services.resume_optimizer import OptimizedResumeData
+from app.services.resume_optimizer import EducationRecord, OptimizedResumeData
 
 class LaTeXResumeRequest(BaseModel):
     """Request model for LaTeX resume generation"""
@@ -366,7 +366,7 @@ class LaTeXGeneratorService:
         
         return "\n".join(latex_content)
     
-    def _generate_education_latex(self, education: List[Dict], template_style: str) -> str:
+    def _generate_education_latex(self, education: List[EducationRecord], template_style: str) -> str:
         """Generate LaTeX for education section"""
         
         if not education:
@@ -375,10 +375,10 @@ class LaTeXGeneratorService:
         latex_content = []
         
         for edu in education:
-            degree = self._escape_latex(edu.get('degree', ''))
-            school = self._escape_latex(edu.get('school', ''))
-            year = self._escape_latex(str(edu.get('year', '')))
-            gpa = edu.get('gpa', '')
+            degree = self._escape_latex(edu.degree)
+            school = self._escape_latex(edu.school)
+            year = self._escape_latex(str(edu.year))
+            gpa = edu.gpa
             
             if template_style == "professional":
                 # ModernCV format
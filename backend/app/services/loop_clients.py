@@ -0,0 +1,31 @@
+"""Async API clients kept per event loop, since pooled connections can't be reused from another loop"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+ClientT = TypeVar('ClientT')
+
+
+class LoopBoundClient(Generic[ClientT]):
+    """Build one client per running event loop on first use and close it with that loop"""
+    
+    def __init__(self, factory: Callable[[], ClientT], close: Optional[Callable[[ClientT], Awaitable]] = None):
+        self._factory = factory
+        self._close = close
+        self._clients: Dict[asyncio.AbstractEventLoop, ClientT] = {}
+    
+    def get(self) -> ClientT:
+        """Client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Clients left behind by loops closed without aclose() can't be closed anymore; drop them
+            for closed_loop in [other for other in self._clients if other.is_closed()]:
+                self._clients.pop(closed_loop, None)
+            client = self._clients[loop] = self._factory()
+        return client
+    
+    async def aclose(self) -> None:
+        """Close the running event loop's client, if one was built; the next get() builds a new one"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None and self._close is not None:
+            await self._close(client)
@@ -1,8 +1,8 @@
 """Project Generator Service for creating realistic projects to fill skill gaps"""
-import json
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import orjson
 from pydantic import BaseModel
 from openai import OpenAI
 import google.generativeai as genai
@@ -47,6 +47,74 @@ class GeneratedProjectData(BaseModel):
     ai_model_used: Optional[str] = None
     template_id: Optional[str] = None
 
+# Predefined project templates by category, built once at import
+_PROJECT_TEMPLATES: Dict[str, Dict[str, Dict]] = {
+    "web_development": {
+        "fullstack_ecommerce": {
+            "title": "E-commerce Platform with {technologies}",
+            "description": "Build a complete e-commerce platform with user authentication, product catalog, shopping cart, and payment processing",
+            "phases": [
+                {"name": "Backend API Development", "skills": ["API design", "database modeling"], "duration_weeks": 2},
+                {"name": "Frontend Development", "skills": ["UI/UX", "state management"], "duration_weeks": 2},
+                {"name": "Payment Integration", "skills": ["payment processing", "security"], "duration_weeks": 1},
+                {"name": "Testing & Deployment", "skills": ["testing", "deployment"], "duration_weeks": 1}
+            ],
+            "target_skills": ["web development", "full-stack", "API development"],
+            "difficulty": "intermediate"
+        },
+        "portfolio_website": {
+            "title": "Professional Portfolio Website",
+            "description": "Create a responsive portfolio website showcasing your projects and skills",
+            "phases": [
+                {"name": "Design & Planning", "skills": ["UI design", "planning"], "duration_weeks": 1},
+                {"name": "Frontend Development", "skills": ["HTML/CSS", "responsive design"], "duration_weeks": 2},
+                {"name": "CMS Integration", "skills": ["content management", "dynamic content"], "duration_weeks": 1}
+            ],
+            "target_skills": ["frontend development", "web design"],
+            "difficulty": "beginner"
+        }
+    },
+    "data_science": {
+        "sales_analytics": {
+            "title": "Sales Performance Analytics Dashboard",
+            "description": "Build a comprehensive analytics dashboard to track and visualize sales performance metrics",
+            "phases": [
+                {"name": "Data Collection & Cleaning", "skills": ["data cleaning", "ETL"], "duration_weeks": 1},
+                {"name": "Analysis & Modeling", "skills": ["statistical analysis", "predictive modeling"], "duration_weeks": 2},
+                {"name": "Dashboard Development", "skills": ["data visualization", "dashboard design"], "duration_weeks": 2}
+            ],
+            "target_skills": ["data analysis", "python", "data visualization"],
+            "difficulty": "intermediate"
+        }
+    },
+    "mobile_development": {
+        "task_manager_app": {
+            "title": "Cross-Platform Task Management App",
+            "description": "Develop a mobile app for task management with offline support and cloud sync",
+            "phases": [
+                {"name": "App Architecture", "skills": ["mobile architecture", "state management"], "duration_weeks": 1},
+                {"name": "Core Features", "skills": ["mobile UI", "local storage"], "duration_weeks": 2},
+                {"name": "Cloud Integration", "skills": ["API integration", "sync mechanisms"], "duration_weeks": 1}
+            ],
+            "target_skills": ["mobile development", "cross-platform"],
+            "difficulty": "intermediate"
+        }
+    },
+    "devops": {
+        "ci_cd_pipeline": {
+            "title": "Complete CI/CD Pipeline with {technologies}",
+            "description": "Set up automated CI/CD pipeline with testing, building, and deployment",
+            "phases": [
+                {"name": "Pipeline Setup", "skills": ["CI/CD", "automation"], "duration_weeks": 1},
+                {"name": "Testing Integration", "skills": ["automated testing", "quality gates"], "duration_weeks": 1},
+                {"name": "Deployment Automation", "skills": ["deployment", "monitoring"], "duration_weeks": 1}
+            ],
+            "target_skills": ["devops", "automation", "deployment"],
+            "difficulty": "advanced"
+        }
+    }
+}
+
 class ProjectGeneratorService:
     """Service for generating realistic projects based on skill gaps"""
     
@@ -66,77 +134,8 @@ class ProjectGeneratorService:
             self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
             self.gemini_enabled = True
         
-        # Load project templates
-        self.project_templates = self._load_project_templates()
-    
-    def _load_project_templates(self) -> Dict:
-        """Load predefined project templates"""
-        return {
-            "web_development": {
-                "fullstack_ecommerce": {
-                    "title": "E-commerce Platform with {technologies}",
-                    "description": "Build a complete e-commerce platform with user authentication, product catalog, shopping cart, and payment processing",
-                    "phases": [
-                        {"name": "Backend API Development", "skills": ["API design", "database modeling"], "duration_weeks": 2},
-                        {"name": "Frontend Development", "skills": ["UI/UX", "state management"], "duration_weeks": 2},
-                        {"name": "Payment Integration", "skills": ["payment processing", "security"], "duration_weeks": 1},
-                        {"name": "Testing & Deployment", "skills": ["testing", "deployment"], "duration_weeks": 1}
-                    ],
-                    "target_skills": ["web development", "full-stack", "API development"],
-                    "difficulty": "intermediate"
-                },
-                "portfolio_website": {
-                    "title": "Professional Portfolio Website",
-                    "description": "Create a responsive portfolio website showcasing your projects and skills",
-                    "phases": [
-                        {"name": "Design & Planning", "skills": ["UI design", "planning"], "duration_weeks": 1},
-                        {"name": "Frontend Development", "skills": ["HTML/CSS", "responsive design"], "duration_weeks": 2},
-                        {"name": "CMS Integration", "skills": ["content management", "dynamic content"], "duration_weeks": 1}
-                    ],
-                    "target_skills": ["frontend development", "web design"],
-                    "difficulty": "beginner"
-                }
-            },
-            "data_science": {
-                "sales_analytics": {
-                    "title": "Sales Performance Analytics Dashboard",
-                    "description": "Build a comprehensive analytics dashboard to track and visualize sales performance metrics",
-                    "phases": [
-                        {"name": "Data Collection & Cleaning", "skills": ["data cleaning", "ETL"], "duration_weeks": 1},
-                        {"name": "Analysis & Modeling", "skills": ["statistical analysis", "predictive modeling"], "duration_weeks": 2},
-                        {"name": "Dashboard Development", "skills": ["data visualization", "dashboard design"], "duration_weeks": 2}
-                    ],
-                    "target_skills": ["data analysis", "python", "data visualization"],
-                    "difficulty": "intermediate"
-                }
-            },
-            "mobile_development": {
-                "task_manager_app": {
-                    "title": "Cross-Platform Task Management App",
-                    "description": "Develop a mobile app for task management with offline support and cloud sync",
-                    "phases": [
-                        {"name": "App Architecture", "skills": ["mobile architecture", "state management"], "duration_weeks": 1},
-                        {"name": "Core Features", "skills": ["mobile UI", "local storage"], "duration_weeks": 2},
-                        {"name": "Cloud Integration", "skills": ["API integration", "sync mechanisms"], "duration_weeks": 1}
-                    ],
-                    "target_skills": ["mobile development", "cross-platform"],
-                    "difficulty": "intermediate"
-                }
-            },
-            "devops": {
-                "ci_cd_pipeline": {
-                    "title": "Complete CI/CD Pipeline with {technologies}",
-                    "description": "Set up automated CI/CD pipeline with testing, building, and deployment",
-                    "phases": [
-                        {"name": "Pipeline Setup", "skills": ["CI/CD", "automation"], "duration_weeks": 1},
-                        {"name": "Testing Integration", "skills": ["automated testing", "quality gates"], "duration_weeks": 1},
-                        {"name": "Deployment Automation", "skills": ["deployment", "monitoring"], "duration_weeks": 1}
-                    ],
-                    "target_skills": ["devops", "automation", "deployment"],
-                    "difficulty": "advanced"
-                }
-            }
-        }
+        # Predefined project templates, shared read-only by every instance
+        self.project_templates = _PROJECT_TEMPLATES
     
     def generate_project_from_gaps(self, gap_result: GapAnalysisResult, request: ProjectGenerationRequest) -> GeneratedProjectData:
         """Main method to generate a project based on gap analysis"""
@@ -241,7 +240,7 @@ class ProjectGeneratorService:
         if result_text.endswith('```'):
             result_text = result_text[:-3]
         
-        project_data = json.loads(result_text)
+        project_data = orjson.loads(result_text)
         project_data['generation_method'] = 'ai'
         project_data['ai_model_used'] = 'openai'
         
@@ -259,7 +258,7 @@ class ProjectGeneratorService:
         if result_text.endswith('```'):
             result_text = result_text[:-3]
         
-        project_data = json.loads(result_text)
+        project_data = orjson.loads(result_text)
         project_data['generation_method'] = 'ai'
         project_data['ai_model_used'] = 'gemini'
         
@@ -9,8 +9,15 @@ import google.generativeai as genai
 
 from app.core.config import settings
 from app.services.industry_analyzer import IndustryAnalyzerService, IndustryType
+from app.services.keyword_matcher import find_keywords, get_keyword_automaton
 from app.services.resume_optimizer import ResumeOptimizerService
 
+def _count_matched_keywords(keywords: List[str], text: str) -> int:
+    """Count the keywords occurring in an already lowercased text with a single automaton scan"""
+    found = find_keywords(get_keyword_automaton(tuple(keywords)), text)
+    # An empty keyword is trivially contained, as with the `in` operator
+    return sum(1 for keyword in keywords if not keyword or keyword.lower() in found)
+
 class OptimizationSuggestion(BaseModel):
     """Individual optimization suggestion"""
     id: str
@@ -369,7 +376,7 @@ class RealTimeOptimizerService:
         required_keywords = job_requirements.get('required_skills', [])
         
         if required_keywords:
-            matched_keywords = sum(1 for keyword in required_keywords if keyword.lower() in all_text)
+            matched_keywords = _count_matched_keywords(required_keywords, all_text)
             keyword_score = matched_keywords / len(required_keywords)
             score += keyword_score * 0.4
         
@@ -397,7 +404,7 @@ class RealTimeOptimizerService:
         required_keywords = job_requirements.get('required_skills', [])
         
         if required_keywords:
-            matched_keywords = sum(1 for keyword in required_keywords if keyword.lower() in all_text)
+            matched_keywords = _count_matched_keywords(required_keywords, all_text)
             score += (matched_keywords / len(required_keywords)) * 0.6
         
         # Structure elements
@@ -435,7 +442,7 @@ class RealTimeOptimizerService:
         
         # Check for industry-specific keywords
         industry_keywords = industry_profile.key_skills + industry_profile.technical_skills
-        matched_keywords = sum(1 for keyword in industry_keywords if keyword.lower() in all_text)
+        matched_keywords = _count_matched_keywords(industry_keywords, all_text)
         
         if industry_keywords:
             return min(matched_keywords / len(industry_keywords), 1.0)
@@ -457,7 +464,7 @@ class RealTimeOptimizerService:
         required_keywords = job_requirements.get('required_skills', [])
         
         if required_keywords:
-            matched_keywords = sum(1 for keyword in required_keywords if keyword.lower() in all_text)
+            matched_keywords = _count_matched_keywords(required_keywords, all_text)
             if matched_keywords / len(required_keywords) < 0.7:
                 areas.append("Keyword optimization")
         
@@ -1,15 +1,184 @@
 """Resume Optimization Service for enhancing and formatting resumes"""
 import re
-import json
-from typing import Dict, List, Optional, Tuple
+import hashlib
+from functools import lru_cache
+from itertools import islice
+import asyncio
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+import httpx
+import orjson
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
 import google.generativeai as genai
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
 from app.core.config import settings
 from app.services.gap_analyzer import GapAnalysisResult
-from app.services.industry_analyzer import IndustryAnalyzerService, IndustryType
+from app.services.industry_analyzer import IndustryAnalyzerService, IndustryProfile, IndustryType
+from app.services.keyword_matcher import build_automaton, contains_any, find_keywords, get_keyword_automaton
+from app.services.loop_clients import LoopBoundClient
+
+# Substrings used to categorize resume skills
+TECHNICAL_SKILL_TERMS = ('python', 'java', 'javascript', 'sql', 'html', 'css')
+TOOL_SKILL_TERMS = ('git', 'docker', 'kubernetes', 'aws', 'azure')
+
+# Verb stems that already make a sentence read as an accomplishment
+IMPLIED_ACTION_VERBS = ('manage', 'develop', 'create', 'lead')
+
+# Personal info formats
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+
+# Quantifiable achievement patterns
+_ACHIEVEMENT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\d+%',  # Percentages
+    r'\$\d+[KMB]?',  # Dollar amounts
+    r'\d+\+?\s*(users?|customers?|clients?)',  # User counts
+    r'\d+\+?\s*(projects?|applications?|systems?)',  # Project counts
+    r'reduced?\s+.*?by\s+\d+%?',  # Reductions
+    r'increased?\s+.*?by\s+\d+%?',  # Increases
+    r'improved?\s+.*?by\s+\d+%?'  # Improvements
+))
+
+# Word tokens for keyword density; keeps "c++", "c#" and "node.js" whole
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+(?:[.\-][a-z0-9+#]+)*')
+
+# Plain words for whole-word action verb matching
+_WORD_RE = re.compile(r'[a-z]+')
+
+# ATS score weights (out of 100)
+ATS_KEYWORD_WEIGHT = 40
+ATS_ACTION_VERB_POINTS = 3
+ATS_ACTION_VERB_CAP = 30
+ATS_ACHIEVEMENTS_WEIGHT = 20
+ATS_SUMMARY_WEIGHT = 10
+
+
+def ats_score(keyword_matches: int, required_count: int, action_verb_count: int,
+              has_achievements: bool, has_summary: bool) -> float:
+    """Combine precomputed ATS match counts into a 0-1 score"""
+    score = 0.0
+    if required_count:
+        score += (keyword_matches / required_count) * ATS_KEYWORD_WEIGHT
+    score += min(action_verb_count * ATS_ACTION_VERB_POINTS, ATS_ACTION_VERB_CAP)
+    if has_achievements:
+        score += ATS_ACHIEVEMENTS_WEIGHT
+    if has_summary:
+        score += ATS_SUMMARY_WEIGHT
+    return min(score, 100.0) / 100.0
+
+
+# Map industry section names to our section names
+INDUSTRY_SECTION_MAPPING = {
+    'technical_skills': 'skills_section',
+    'experience': 'experience_section',
+    'projects': 'projects_section',
+    'certifications': 'education_section',
+    'education': 'education_section',
+    'skills': 'skills_section',
+    'achievements': 'experience_section'
+}
+
+
+# Section order per optimization focus when no industry priorities are known;
+# ats and creative use the default
+DEFAULT_SECTION_ORDER = (
+    "personal_info", "professional_summary",
+    "experience_section", "skills_section", "education_section", "projects_section"
+)
+FOCUS_SECTION_ORDERS = {
+    "technical": (
+        "personal_info", "professional_summary",
+        "skills_section", "projects_section", "experience_section", "education_section"
+    ),
+    "executive": (
+        "personal_info", "professional_summary",
+        "experience_section", "education_section", "skills_section"
+    ),
+}
+
+
+@lru_cache(maxsize=128)
+def _industry_section_order(priorities: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Section order following industry section priorities, then any remaining sections"""
+    base_order = ["personal_info", "professional_summary"]
+    seen = set(base_order)
+    
+    mapped_sections = [INDUSTRY_SECTION_MAPPING[p] for p in priorities if p in INDUSTRY_SECTION_MAPPING]
+    all_sections = ["experience_section", "skills_section", "education_section", "projects_section"]
+    for section in mapped_sections + all_sections:
+        if section not in seen:
+            seen.add(section)
+            base_order.append(section)
+    
+    return tuple(base_order)
+
+
+@lru_cache(maxsize=256)
+def _parse_float(value) -> float:
+    """Parse a GPA-style value to float, 0.0 when empty or invalid"""
+    try:
+        return float(value) if value else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+# Maximum number of AI bullet rewrites kept per service
+REWRITE_CACHE_SIZE = 512
+
+# OpenAI errors worth retrying before falling back to templates
+TRANSIENT_OPENAI_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# Bullet line in AI responses, capturing the text after the bullet character.
+# MULTILINE lets one finditer pass walk a whole response (or a batch of them)
+_BULLET_LINE_RE = re.compile(r'^[ \t]*[•\-*]+[ \t]*(\S.*?)[ \t\r]*$', re.MULTILINE)
+
+# End of a response's bullet block: a bullet line, blank lines, then a line that
+# isn't a bullet (group 1 is where the block ends). Blank lines between bullets and
+# a lead-in like "Here are the bullets:\n\n" before them don't end the block
+_BULLET_BLOCK_END_RE = re.compile(r'^[ \t]*[•\-*]+[ \t]*\S.*(\n)(?:[ \t\r]*\n)+[ \t]*[^•\-*\s]', re.MULTILINE)
+
+def parse_bullets(text: str, limit: Optional[int] = None) -> List[str]:
+    """Extract bullet point texts from an AI response in a single regex scan"""
+    return [match.group(1) for match in islice(_BULLET_LINE_RE.finditer(text), limit)]
+
+
+class _StreamedReply:
+    """Text of a streamed AI reply, optionally ending with its bullet block"""
+    
+    def __init__(self, stop_after_bullets: bool = False):
+        self._text = ''
+        self._stop_after_bullets = stop_after_bullets
+        self._block_end: Optional[int] = None
+        # Start of the last complete non-blank line: a block end found later starts there
+        # or after it, so each chunk is searched from there instead of from the start
+        self._search_from = 0
+        # Start of the first line not yet checked for being blank
+        self._next_line = 0
+    
+    @property
+    def text(self) -> str:
+        return self._text[:self._block_end].strip()
+    
+    def add(self, chunk: str) -> bool:
+        """Append a chunk; True once the bullet block has ended and reading can stop"""
+        self._text += chunk
+        if not self._stop_after_bullets:
+            return False
+        
+        block_end = _BULLET_BLOCK_END_RE.search(self._text, self._search_from)
+        if block_end:
+            self._block_end = block_end.start(1)
+            return True
+        
+        while (line_end := self._text.find('\n', self._next_line)) != -1:
+            if self._text[self._next_line:line_end].strip():
+                self._search_from = self._next_line
+            self._next_line = line_end + 1
+        return False
 
 class ResumeOptimizationRequest(BaseModel):
     """Request model for resume optimization"""
@@ -21,6 +190,16 @@ class ResumeOptimizationRequest(BaseModel):
     max_pages: int = 2
     format_style: str = "professional"  # professional, modern, classic
 
+@dataclass(slots=True)
+class EducationRecord:
+    """Optimized education entry"""
+    degree: str = ''
+    school: str = ''
+    year: Union[str, int] = ''
+    gpa: Union[str, float] = ''
+    relevant_coursework: List[str] = field(default_factory=list)
+    honors: List[str] = field(default_factory=list)
+
 class OptimizedResumeData(BaseModel):
     """Optimized resume data model"""
     # Personal Information
@@ -30,7 +209,7 @@ class OptimizedResumeData(BaseModel):
     professional_summary: str
     skills_section: Dict
     experience_section: List[Dict]
-    education_section: List[Dict]
+    education_section: List[EducationRecord]
     projects_section: List[Dict] = []
     
     # Formatting
@@ -43,12 +222,22 @@ class OptimizedResumeData(BaseModel):
     optimization_notes: List[str]
     improvements_made: List[str]
 
+def _build_openai_client() -> AsyncOpenAI:
+    """Pooled OpenAI client; retries are handled by _create_chat_completion, so the SDK's own are off"""
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+    )
+
 class ResumeOptimizerService:
     """Service for optimizing and enhancing resumes with industry-specific intelligence"""
     
     def __init__(self):
         # Initialize AI clients
-        self.openai_client = None
+        self._openai_clients = None
         self.gemini_model = None
         self.openai_enabled = False
         self.gemini_enabled = False
@@ -57,7 +246,9 @@ class ResumeOptimizerService:
         self.industry_analyzer = IndustryAnalyzerService()
         
         if settings.OPENAI_API_KEY:
-            self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            # One pooled client per service and event loop so keep-alive connections are
+            # reused across calls without leaking into another loop (each sync call runs its own)
+            self._openai_clients = LoopBoundClient(_build_openai_client, close=lambda client: client.close())
             self.openai_enabled = True
             
         if settings.GEMINI_API_KEY:
@@ -68,6 +259,35 @@ class ResumeOptimizerService:
         # ATS keywords and optimization rules
         self.ats_keywords = self._load_ats_keywords()
         self.optimization_rules = self._load_optimization_rules()
+        
+        # AI bullet rewrites keyed by (description hash, job requirements hash, industry), in LRU order
+        self.rewrite_cache = OrderedDict()
+        
+        # Keyword automatons for skill categorization
+        self._tech_automaton = build_automaton(TECHNICAL_SKILL_TERMS)
+        self._tools_automaton = build_automaton(TOOL_SKILL_TERMS)
+        
+        # Action verbs checked by the ATS score, built once per service. Matched as
+        # whole words against a token set rather than with a substring automaton,
+        # which would also count "built" inside "rebuilt"
+        self._top_action_verbs_set = frozenset(verb.lower() for verb in self.ats_keywords["action_verbs"][:10])
+        
+        # Section orders for the known industry priority lists
+        self.industry_section_orders = {
+            priorities: _industry_section_order(priorities)
+            for priorities in {
+                tuple(profile.section_priorities)
+                for profile in self.industry_analyzer.industry_profiles.values()
+            }
+        }
+        
+        # Lowercased action verbs per industry (profile verbs plus generic ATS verbs)
+        self.action_verb_sets = {
+            industry: frozenset(
+                verb.lower() for verb in profile.preferred_action_verbs + self.ats_keywords["action_verbs"]
+            )
+            for industry, profile in self.industry_analyzer.industry_profiles.items()
+        }
     
     def _load_ats_keywords(self) -> Dict[str, List[str]]:
         """Load ATS-friendly keywords by category"""
@@ -129,15 +349,64 @@ class ResumeOptimizerService:
             }
         }
     
+    @property
+    def openai_client(self) -> Optional[AsyncOpenAI]:
+        """OpenAI client for the running event loop, None without an API key"""
+        return self._openai_clients.get() if self._openai_clients else None
+    
+    @openai_client.setter
+    def openai_client(self, client: Optional[AsyncOpenAI]):
+        """Use the given client (e.g. a stub) in every event loop; it's left open by aclose()"""
+        self._openai_clients = None if client is None else LoopBoundClient(lambda: client)
+    
+    async def aclose(self):
+        """Close the OpenAI client built for the running event loop"""
+        if self._openai_clients:
+            await self._openai_clients.aclose()
+    
     def optimize_resume(
         self, 
         resume_data: Dict, 
         job_requirements: Dict, 
         request: ResumeOptimizationRequest,
         generated_projects: List[Dict] = None
+    ) -> OptimizedResumeData:
+        """Synchronous wrapper around optimize_resume_async for callers without an event loop"""
+        async def optimize_and_close():
+            try:
+                return await self.optimize_resume_async(resume_data, job_requirements, request, generated_projects)
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(optimize_and_close())
+    
+    async def optimize_resume_async(
+        self, 
+        resume_data: Dict, 
+        job_requirements: Dict, 
+        request: ResumeOptimizationRequest,
+        generated_projects: List[Dict] = None
     ) -> OptimizedResumeData:
         """Main method to optimize resume with industry-specific intelligence"""
         
+        # The final streamed item is the fully optimized resume
+        async for _, optimized_resume in self.stream_optimized_sections(resume_data, job_requirements, request, generated_projects):
+            pass
+        return optimized_resume
+    
+    async def stream_optimized_sections(
+        self, 
+        resume_data: Dict, 
+        job_requirements: Dict, 
+        request: ResumeOptimizationRequest,
+        generated_projects: List[Dict] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (section_name, content) pairs as each section is optimized.
+        
+        Lets callers render the summary before the slower experience rewrite
+        finishes. The last pair is ("optimized_resume", OptimizedResumeData).
+        """
+        
         print(f"Optimizing resume for: {request.target_job_title}")
         print(f"Focus: {request.optimization_focus}")
         
@@ -151,28 +420,57 @@ class ResumeOptimizerService:
         print(f"Detected industry: {industry} (confidence: {confidence:.2f})")
         print(f"Optimization strategy: {optimization_strategy['content_style']}")
         
-        # Extract and enhance each section with industry context
-        optimized_data = {
-            "personal_info": self._optimize_personal_info(resume_data.get('personal_info', {})),
-            "professional_summary": self._create_professional_summary(resume_data, job_requirements, request, industry),
-            "skills_section": self._optimize_skills_section(resume_data, job_requirements, industry),
-            "experience_section": self._optimize_experience_section(resume_data, job_requirements, request, industry),
-            "education_section": self._optimize_education_section(resume_data.get('education', [])),
-            "projects_section": self._integrate_projects_section(resume_data, generated_projects, request),
-            "section_order": self._determine_section_order(request, optimization_strategy),
-            "formatting_style": request.format_style,
-            "industry_detected": industry,
-            "industry_confidence": confidence,
-            "optimization_strategy": optimization_strategy
-        }
+        # Start the experience rewrite (the slowest section) so its AI calls
+        # overlap with the summary generation
+        experience_task = asyncio.ensure_future(
+            self._optimize_experience_section(resume_data, job_requirements, request, industry)
+        )
+        
+        try:
+            # Extract and enhance each section with industry context
+            optimized_data = {
+                "formatting_style": request.format_style,
+                "industry_detected": industry,
+                "industry_confidence": confidence,
+                "optimization_strategy": optimization_strategy
+            }
+            
+            optimized_data["personal_info"] = self._optimize_personal_info(resume_data.get('personal_info', {}))
+            yield "personal_info", optimized_data["personal_info"]
+            
+            optimized_data["professional_summary"] = await self._create_professional_summary(resume_data, job_requirements, request, industry)
+            yield "professional_summary", optimized_data["professional_summary"]
+            
+            optimized_data["skills_section"] = self._optimize_skills_section(resume_data, job_requirements, industry)
+            yield "skills_section", optimized_data["skills_section"]
+            
+            optimized_data["experience_section"] = await experience_task
+            optimized_data["_has_quantified_achievements"] = any(
+                entry["achievements"] for entry in optimized_data["experience_section"]
+            )
+            yield "experience_section", optimized_data["experience_section"]
+            
+            optimized_data["education_section"] = self._optimize_education_section(resume_data.get('education', []))
+            yield "education_section", optimized_data["education_section"]
+            
+            optimized_data["projects_section"] = self._integrate_projects_section(resume_data, generated_projects, request)
+            yield "projects_section", optimized_data["projects_section"]
+            
+            optimized_data["section_order"] = self._determine_section_order(request, optimization_strategy)
+            yield "section_order", optimized_data["section_order"]
+        finally:
+            # Don't leave AI calls running if the consumer stops early
+            if not experience_task.done():
+                experience_task.cancel()
         
         # Calculate optimization metrics
-        ats_score = self._calculate_ats_score(optimized_data, job_requirements)
-        keyword_density = self._calculate_keyword_density(optimized_data, job_requirements)
+        normalized_text = self._normalize_scoring_text(optimized_data)
+        ats_score = self._calculate_ats_score(optimized_data, job_requirements, normalized_text)
+        keyword_density = self._calculate_keyword_density(optimized_data, job_requirements, normalized_text)
         optimization_notes = self._generate_optimization_notes(optimized_data, request)
         improvements_made = self._track_improvements(resume_data, optimized_data)
         
-        return OptimizedResumeData(
+        yield "optimized_resume", OptimizedResumeData(
             **optimized_data,
             ats_score=ats_score,
             keyword_density=keyword_density,
@@ -180,6 +478,96 @@ class ResumeOptimizerService:
             improvements_made=improvements_made
         )
     
+    async def stream_optimization_events(
+        self, 
+        resume_data: Dict, 
+        job_requirements: Dict, 
+        request: ResumeOptimizationRequest,
+        generated_projects: List[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield Server-Sent Event payloads: a "section" event per optimized section, then
+        "complete" with the optimized resume, or an "error" event once optimization fails"""
+        try:
+            async for section_name, content in self.stream_optimized_sections(
+                resume_data, job_requirements, request, generated_projects
+            ):
+                if section_name == "optimized_resume":
+                    yield {'type': 'complete', 'data': content.model_dump()}
+                else:
+                    yield {'type': 'section', 'section': section_name, 'data': content}
+        except Exception as e:
+            yield {'type': 'error', 'message': str(e)}
+    
+    async def _generate_text(
+        self, 
+        system_prompt: str, 
+        prompt: str, 
+        temperature: float, 
+        max_tokens: int,
+        stop_after_bullets: bool = False
+    ) -> str:
+        """Generate a completion with the enabled AI provider, streaming the tokens.
+        
+        With stop_after_bullets, reading stops at the first line after the bullet block,
+        so a lead-in paragraph or blank lines between bullets don't end the response.
+        """
+        
+        if self.openai_enabled:
+            stream = await self._create_chat_completion(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            reply = _StreamedReply(stop_after_bullets)
+            async for chunk in stream:
+                if chunk.choices and reply.add(chunk.choices[0].delta.content or ''):
+                    # Closing the stream stops generating the rest of the reply
+                    await stream.close()
+                    break
+            return reply.text
+        
+        elif self.gemini_enabled:
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config=genai.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                ),
+                stream=True
+            )
+            reply = _StreamedReply(stop_after_bullets)
+            async for chunk in response:
+                if reply.add(chunk.text):
+                    break
+            return reply.text
+        
+        raise RuntimeError("No AI provider is enabled")
+    
+    @staticmethod
+    def _format_industry_context(industry_profile: IndustryProfile) -> str:
+        """Render the industry profile as a compact pipe-separated prompt line"""
+        return " | ".join([
+            f"style:{industry_profile.content_style}",
+            f"verbs:{','.join(industry_profile.preferred_action_verbs[:5])}",
+            f"focus:{','.join(industry_profile.achievement_focus[:5])}",
+            f"metrics:{','.join(industry_profile.metric_types[:5])}"
+        ])
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(min=1, max=8),
+        retry=retry_if_exception_type(TRANSIENT_OPENAI_ERRORS),
+        reraise=True
+    )
+    async def _create_chat_completion(self, **kwargs):
+        """Create an OpenAI chat completion, retrying transient failures with jittered backoff"""
+        return await self.openai_client.chat.completions.create(**kwargs)
+    
     def _optimize_personal_info(self, personal_info: Dict) -> Dict:
         """Optimize personal information section"""
         optimized = personal_info.copy()
@@ -187,12 +575,12 @@ class ResumeOptimizerService:
         # Ensure professional email format
         if 'email' in optimized:
             email = optimized['email']
-            if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+            if not _EMAIL_RE.match(email):
                 optimized['email_note'] = "Consider using a professional email address"
         
         # Format phone number consistently
         if 'phone' in optimized:
-            phone = re.sub(r'[^\d]', '', optimized['phone'])
+            phone = _NON_DIGIT_RE.sub('', optimized['phone'])
             if len(phone) == 10:
                 optimized['phone'] = f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
         
@@ -204,7 +592,7 @@ class ResumeOptimizerService:
         
         return optimized
     
-    def _create_professional_summary(
+    async def _create_professional_summary(
         self, 
         resume_data: Dict, 
         job_requirements: Dict, 
@@ -216,14 +604,14 @@ class ResumeOptimizerService:
         # Try AI-powered summary first
         if self.openai_enabled or self.gemini_enabled:
             try:
-                return self._create_ai_summary(resume_data, job_requirements, request, industry)
+                return await self._create_ai_summary(resume_data, job_requirements, request, industry)
             except Exception as e:
                 print(f"AI summary failed: {e}")
         
         # Fallback to template-based summary
         return self._create_template_summary(resume_data, job_requirements, request, industry)
     
-    def _create_ai_summary(
+    async def _create_ai_summary(
         self, 
         resume_data: Dict, 
         job_requirements: Dict, 
@@ -247,14 +635,10 @@ class ResumeOptimizerService:
         COMPANY: {request.target_company or 'N/A'}
         INDUSTRY: {industry.value.title()} ({request.target_industry or 'N/A'})
         
-        INDUSTRY CONTEXT:
-        - Content Style: {industry_profile.content_style}
-        - Key Focus Areas: {', '.join(industry_profile.achievement_focus[:5])}
-        - Preferred Action Verbs: {', '.join(industry_profile.preferred_action_verbs[:8])}
-        - Important Metrics: {', '.join(industry_profile.metric_types[:5])}
+        INDUSTRY CONTEXT: {self._format_industry_context(industry_profile)}
         
         CANDIDATE EXPERIENCE:
-        {json.dumps(experience[:3], indent=2)}
+        {orjson.dumps(experience[:3], option=orjson.OPT_INDENT_2).decode()}
         
         CANDIDATE SKILLS:
         {', '.join(skills[:10])}
@@ -276,21 +660,12 @@ class ResumeOptimizerService:
         """
         
         try:
-            if self.openai_enabled:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": "You are an expert resume writer who creates compelling professional summaries that are both ATS-friendly and engaging to hiring managers."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=200
-                )
-                return response.choices[0].message.content.strip()
-            
-            elif self.gemini_enabled:
-                response = self.gemini_model.generate_content(prompt)
-                return response.text.strip()
+            return await self._generate_text(
+                "You are an expert resume writer who creates compelling professional summaries that are both ATS-friendly and engaging to hiring managers.",
+                prompt,
+                temperature=0.7,
+                max_tokens=150
+            )
                 
         except Exception as e:
             print(f"AI summary generation failed: {e}")
@@ -313,7 +688,8 @@ class ResumeOptimizerService:
         
         # Get relevant skills
         required_skills = job_requirements.get('required_skills', [])
-        matching_skills = [skill for skill in skills if skill.lower() in [rs.lower() for rs in required_skills]]
+        required_lower = {rs.lower() for rs in required_skills}
+        matching_skills = [skill for skill in skills if skill.lower() in required_lower]
         
         # Template summary
         experience_level = "Experienced" if years_experience >= 5 else "Results-driven"
@@ -342,18 +718,25 @@ class ResumeOptimizerService:
         soft_skills = []
         tools_frameworks = []
         
+        # Lowercase each skill once for categorization and prioritization
+        skills_lower = {skill: skill.lower() for skill in current_skills}
+        
         for skill in current_skills:
-            skill_lower = skill.lower()
-            if any(tech in skill_lower for tech in ['python', 'java', 'javascript', 'sql', 'html', 'css']):
+            skill_lower = skills_lower[skill]
+            if contains_any(self._tech_automaton, skill_lower):
                 technical_skills.append(skill)
-            elif any(tool in skill_lower for tool in ['git', 'docker', 'kubernetes', 'aws', 'azure']):
+            elif contains_any(self._tools_automaton, skill_lower):
                 tools_frameworks.append(skill)
             else:
                 soft_skills.append(skill)
         
+        # Weigh all skills against the industry profile once
+        industry_weights = self.industry_analyzer.calculate_skill_weights(current_skills, industry)
+        
         # Prioritize job-relevant skills
-        prioritized_technical = self._prioritize_skills(technical_skills, required_skills + preferred_skills, industry)
-        prioritized_tools = self._prioritize_skills(tools_frameworks, required_skills + preferred_skills, industry)
+        target_skills = required_skills + preferred_skills
+        prioritized_technical = self._prioritize_skills(technical_skills, target_skills, industry, industry_weights, skills_lower)
+        prioritized_tools = self._prioritize_skills(tools_frameworks, target_skills, industry, industry_weights, skills_lower)
         
         return {
             "technical_skills": prioritized_technical[:8],
@@ -362,24 +745,44 @@ class ResumeOptimizerService:
             "all_skills": current_skills  # Keep original for reference
         }
     
-    def _prioritize_skills(self, skills: List[str], target_skills: List[str], industry: IndustryType = IndustryType.GENERAL) -> List[str]:
+    def _prioritize_skills(
+        self, 
+        skills: List[str], 
+        target_skills: List[str], 
+        industry: IndustryType = IndustryType.GENERAL,
+        industry_weights: Optional[Dict[str, float]] = None,
+        skills_lower: Optional[Dict[str, str]] = None
+    ) -> List[str]:
         """Prioritize skills based on job requirements and industry context"""
         
-        # Get industry-specific skill weights
-        industry_weights = self.industry_analyzer.calculate_skill_weights(skills, industry)
+        # Without targets every score is zero, so the order is alphabetical
+        if not target_skills:
+            return sorted(skills)
+        
+        # Get industry-specific skill weights unless the caller already has them
+        if industry_weights is None:
+            industry_weights = self.industry_analyzer.calculate_skill_weights(skills, industry)
+        if skills_lower is None:
+            skills_lower = {skill: skill.lower() for skill in skills}
+        
+        # Lowercase targets once for O(1) exact-match lookups. Partial matches
+        # run in C: an automaton finds targets inside the skill, and a single
+        # joined string finds the skill inside any target
+        target_lower = frozenset(t.lower() for t in target_skills)
+        target_automaton = get_keyword_automaton(tuple(sorted(target_lower)))
+        joined_targets = '\x00'.join(target_lower)
         
         # Create priority scores
         skill_scores = {}
         for skill in skills:
             score = 0
-            skill_lower = skill.lower()
+            skill_lower = skills_lower[skill]
             
-            # Higher score for exact matches
-            for target in target_skills:
-                if skill_lower == target.lower():
-                    score += 10
-                elif target.lower() in skill_lower or skill_lower in target.lower():
-                    score += 5
+            # Higher score for exact matches, lower for partial matches
+            if skill_lower in target_lower:
+                score += 10
+            elif target_lower and (contains_any(target_automaton, skill_lower) or skill_lower in joined_targets):
+                score += 5
             
             # Apply industry-specific weighting
             industry_weight = industry_weights.get(skill, 0.5)
@@ -390,7 +793,7 @@ class ResumeOptimizerService:
         # Sort by score, then alphabetically
         return sorted(skills, key=lambda x: (-skill_scores.get(x, 0), x))
     
-    def _optimize_experience_section(
+    async def _optimize_experience_section(
         self, 
         resume_data: Dict, 
         job_requirements: Dict, 
@@ -400,40 +803,64 @@ class ResumeOptimizerService:
         """Optimize work experience section with AI-powered enhancement"""
         
         experience = resume_data.get('experience', [])
-        optimized_experience = []
         
+        # Optimize each distinct description once; duplicated entries (common
+        # in imported or template-filled resumes) reuse the same result
+        content_tasks = {}
+        for exp in experience:
+            content = exp.get('content', '')
+            content_key = self._content_hash(content)
+            if content_key not in content_tasks:
+                content_tasks[content_key] = self._optimize_experience_content(content, job_requirements, industry)
+        optimized_contents = dict(zip(content_tasks, await asyncio.gather(*content_tasks.values())))
+        
+        optimized_experience = []
         for exp in experience:
             original_content = exp.get('content', '')
+            optimized_description, achievements, keywords_added = optimized_contents[self._content_hash(original_content)]
             
-            # AI-optimize the job description with industry context
-            optimized_description = self._optimize_job_description(original_content, job_requirements, industry)
-            
-            # Extract achievements
-            achievements = self._extract_achievements(original_content)
-            
-            # Track keywords added during optimization
-            keywords_added = self._identify_added_keywords(
-                original_content, 
-                optimized_description, 
-                job_requirements
-            )
-            
-            optimized_exp = {
+            optimized_experience.append({
                 "company": exp.get('company', ''),
                 "title": exp.get('title', ''),
                 "dates": exp.get('dates', ''),
                 "location": exp.get('location', ''),
-                "description": optimized_description,
-                "achievements": achievements,
-                "keywords_added": keywords_added,
+                "description": list(optimized_description),
+                "achievements": list(achievements),
+                "keywords_added": list(keywords_added),
                 "original_content": original_content,  # Keep for comparison
                 "optimization_applied": True
-            }
-            
-            optimized_experience.append(optimized_exp)
+            })
         
         return optimized_experience
     
+    async def _optimize_experience_content(
+        self, 
+        content: str, 
+        job_requirements: Dict, 
+        industry: IndustryType = IndustryType.GENERAL
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """Rewrite one experience description, returning (description, achievements, keywords_added)"""
+        
+        # AI-optimize the job description with industry context while extracting achievements
+        optimized_description, achievements = await asyncio.gather(
+            self._optimize_job_description(content, job_requirements, industry),
+            self._extract_achievements(content)
+        )
+        
+        # Track keywords added during optimization
+        keywords_added = self._identify_added_keywords(
+            content, 
+            optimized_description, 
+            job_requirements
+        )
+        
+        return optimized_description, achievements, keywords_added
+    
+    @staticmethod
+    def _content_hash(content: str) -> bytes:
+        """Fixed-size digest identifying a piece of resume text"""
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+    
     def _identify_added_keywords(self, original: str, optimized: List[str], job_requirements: Dict) -> List[str]:
         """Identify keywords that were added during optimization"""
         
@@ -442,38 +869,64 @@ class ResumeOptimizerService:
         for key in ['required_skills', 'preferred_skills', 'technologies', 'tools']:
             all_job_keywords.extend(job_requirements.get(key, []))
         
-        # Convert to lowercase for comparison
+        # Convert to lowercase for comparison, remembering the first casing seen
         job_keywords_lower = [kw.lower() for kw in all_job_keywords]
+        casing_map = {}
+        for kw, kw_lower in zip(all_job_keywords, job_keywords_lower):
+            casing_map.setdefault(kw_lower, kw)
         original_lower = original.lower()
         optimized_text = ' '.join(optimized).lower()
         
+        # Scan each text once for all job keywords
+        automaton = get_keyword_automaton(tuple(job_keywords_lower))
+        optimized_found = find_keywords(automaton, optimized_text)
+        original_found = find_keywords(automaton, original_lower)
+        
         # Find keywords that appear in optimized version but not in original
         added_keywords = []
         for keyword in job_keywords_lower:
-            if keyword in optimized_text and keyword not in original_lower:
-                # Find the original casing from job_requirements
-                original_keyword = next((kw for kw in all_job_keywords if kw.lower() == keyword), keyword)
-                added_keywords.append(original_keyword)
+            if keyword in optimized_found and keyword not in original_found:
+                # Use the original casing from job_requirements
+                added_keywords.append(casing_map[keyword])
         
         return added_keywords[:10]  # Limit to top 10
     
-    def _optimize_job_description(self, description: str, job_requirements: Dict, industry: IndustryType = IndustryType.GENERAL) -> List[str]:
+    async def _optimize_job_description(self, description: str, job_requirements: Dict, industry: IndustryType = IndustryType.GENERAL) -> List[str]:
         """Optimize job description with AI-powered bullet point rewriting"""
         
         if not description:
             return []
         
-        # Try AI-powered optimization first
+        # Try AI-powered optimization first, reusing earlier rewrites of the
+        # same description for the same job
         try:
             if self.openai_enabled or self.gemini_enabled:
-                return self._ai_optimize_job_description(description, job_requirements, industry)
+                cache_key = (
+                    self._content_hash(description),
+                    hashlib.blake2b(orjson.dumps(job_requirements, option=orjson.OPT_SORT_KEYS), digest_size=16).digest(),
+                    industry
+                )
+                bullet_points = self.rewrite_cache.get(cache_key)
+                if bullet_points is not None:
+                    self.rewrite_cache.move_to_end(cache_key)
+                    return list(bullet_points)
+                
+                bullet_points = await self._ai_optimize_job_description(description, job_requirements, industry)
+                if bullet_points:
+                    self.rewrite_cache[cache_key] = bullet_points
+                    if len(self.rewrite_cache) > REWRITE_CACHE_SIZE:
+                        # Evict the least recently used rewrite
+                        self.rewrite_cache.popitem(last=False)
+                    return list(bullet_points)
+                # An empty rewrite isn't cached, so the next call asks the AI again
+                print("AI job description optimization returned no bullet points")
         except Exception as e:
             print(f"AI job description optimization failed: {e}")
         
         # Fallback to template-based optimization
         return self._template_optimize_job_description(description, job_requirements, industry)
     
-    def _ai_optimize_job_description(self, description: str, job_requirements: Dict, industry: IndustryType = IndustryType.GENERAL) -> List[str]:
+    async def _ai_optimize_job_description(self, description: str, job_requirements: Dict, industry: IndustryType = IndustryType.GENERAL) -> List[str]:
         """Use AI to intelligently rewrite job description bullet points"""
         
         # Extract key job requirements for context
@@ -497,11 +950,7 @@ class ResumeOptimizerService:
         - Technologies: {', '.join(technologies[:8])}
         - Key Responsibilities: {', '.join(responsibilities[:5])}
 
-        INDUSTRY CONTEXT ({industry.value.upper()}):
-        - Content Style: {industry_profile.content_style}
-        - Preferred Action Verbs: {', '.join(industry_profile.preferred_action_verbs[:10])}
-        - Key Achievement Areas: {', '.join(industry_profile.achievement_focus[:5])}
-        - Typical Metrics: {', '.join(industry_profile.metric_types[:5])}
+        INDUSTRY CONTEXT ({industry.value.upper()}): {self._format_industry_context(industry_profile)}
 
         REWRITING GUIDELINES:
         1. Start each bullet with strong action verbs preferred in {industry.value} industry
@@ -522,33 +971,16 @@ class ResumeOptimizerService:
         """
         
         try:
-            if self.openai_enabled:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": "You are an expert resume writer who specializes in creating compelling, ATS-optimized bullet points that highlight achievements and match job requirements."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=400
-                )
-                result = response.choices[0].message.content.strip()
-                
-            elif self.gemini_enabled:
-                response = self.gemini_model.generate_content(prompt)
-                result = response.text.strip()
-            
-            # Parse the AI response into bullet points
-            bullet_points = []
-            for line in result.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('•') or line.startswith('-') or line.startswith('*')):
-                    # Remove bullet character and clean up
-                    cleaned_line = line.lstrip('•-*').strip()
-                    if cleaned_line:
-                        bullet_points.append(cleaned_line)
+            result = await self._generate_text(
+                "You are an expert resume writer who specializes in creating compelling, ATS-optimized bullet points that highlight achievements and match job requirements.",
+                prompt,
+                temperature=0.7,
+                max_tokens=280,
+                stop_after_bullets=True
+            )
             
-            return bullet_points[:6]  # Limit to 6 bullet points
+            # Parse the AI response into bullet points, stopping after 6
+            return parse_bullets(result, 6)
             
         except Exception as e:
             print(f"AI job description optimization failed: {e}")
@@ -565,31 +997,35 @@ class ResumeOptimizerService:
         
         # Convert to bullet points with industry-appropriate action verbs
         bullet_points = []
-        action_verbs = industry_profile.preferred_action_verbs + self.ats_keywords["action_verbs"]
-        required_skills = job_requirements.get('required_skills', [])
+        action_verbs_lower = self.action_verb_sets.get(industry, self.action_verb_sets[IndustryType.GENERAL])
+        required_skills_automaton = get_keyword_automaton(
+            tuple(skill.lower() for skill in job_requirements.get('required_skills', []))
+        )
         
         for sentence in sentences[:6]:  # Limit to 6 bullet points
+            sentence_lower = sentence.lower()
+            
             # Ensure starts with action verb
-            words = sentence.split()
-            if words and words[0].lower() not in [av.lower() for av in action_verbs]:
+            words = sentence_lower.split()
+            if words and words[0] not in action_verbs_lower:
                 # Try to add an industry-appropriate action verb
-                if any(verb in sentence.lower() for verb in ["manage", "develop", "create", "lead"]):
+                if any(verb in sentence_lower for verb in IMPLIED_ACTION_VERBS):
                     # Sentence already has action verb, just rephrase
                     pass
                 else:
                     # Add action verb based on context and industry
-                    if any(skill.lower() in sentence.lower() for skill in required_skills):
+                    if contains_any(required_skills_automaton, sentence_lower):
                         # Use industry-appropriate verb
                         preferred_verb = industry_profile.preferred_action_verbs[0] if industry_profile.preferred_action_verbs else "Utilized"
-                        sentence = f"{preferred_verb} {sentence.lower()}"
+                        sentence = f"{preferred_verb} {sentence_lower}"
                     else:
-                        sentence = f"Contributed to {sentence.lower()}"
+                        sentence = f"Contributed to {sentence_lower}"
             
             bullet_points.append(sentence)
         
         return bullet_points
     
-    def _extract_achievements(self, description: str) -> List[str]:
+    async def _extract_achievements(self, description: str) -> List[str]:
         """Extract and enhance quantifiable achievements from description"""
         
         if not description:
@@ -598,14 +1034,14 @@ class ResumeOptimizerService:
         # Try AI-powered achievement extraction first
         try:
             if self.openai_enabled or self.gemini_enabled:
-                return self._ai_extract_achievements(description)
+                return await self._ai_extract_achievements(description)
         except Exception as e:
             print(f"AI achievement extraction failed: {e}")
         
         # Fallback to pattern-based extraction
         return self._pattern_extract_achievements(description)
     
-    def _ai_extract_achievements(self, description: str) -> List[str]:
+    async def _ai_extract_achievements(self, description: str) -> List[str]:
         """Use AI to identify and enhance achievements"""
         
         prompt = f"""
@@ -631,30 +1067,16 @@ class ResumeOptimizerService:
         """
         
         try:
-            if self.openai_enabled:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": "You are an expert resume writer who specializes in identifying and quantifying professional achievements."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.6,
-                    max_tokens=200
-                )
-                result = response.choices[0].message.content.strip()
-                
-            elif self.gemini_enabled:
-                response = self.gemini_model.generate_content(prompt)
-                result = response.text.strip()
-            
-            # Parse achievements from AI response
-            achievements = []
-            for line in result.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('-') and not line.startswith('•'):
-                    achievements.append(line)
+            result = await self._generate_text(
+                "You are an expert resume writer who specializes in identifying and quantifying professional achievements.",
+                prompt,
+                temperature=0.6,
+                max_tokens=200
+            )
             
-            return achievements[:3]
+            # Parse achievements from AI response, stopping after 3
+            lines = map(str.strip, result.splitlines())
+            return list(islice((line for line in lines if line and not line.startswith(('-', '•'))), 3))
             
         except Exception as e:
             print(f"AI achievement extraction failed: {e}")
@@ -665,37 +1087,29 @@ class ResumeOptimizerService:
         
         achievements = []
         
-        # Look for numbers and percentages
-        number_patterns = [
-            r'\d+%',  # Percentages
-            r'\$\d+[KMB]?',  # Dollar amounts
-            r'\d+\+?\s*(users?|customers?|clients?)',  # User counts
-            r'\d+\+?\s*(projects?|applications?|systems?)',  # Project counts
-            r'reduced?\s+.*?by\s+\d+%?',  # Reductions
-            r'increased?\s+.*?by\s+\d+%?',  # Increases
-            r'improved?\s+.*?by\s+\d+%?'  # Improvements
-        ]
-        
-        for pattern in number_patterns:
-            matches = re.findall(pattern, description, re.IGNORECASE)
-            achievements.extend(matches)
+        # Look for numbers and percentages, stopping at the top 3
+        for pattern in _ACHIEVEMENT_PATTERNS:
+            for match in pattern.finditer(description):
+                achievements.append(match.group())
+                if len(achievements) >= 3:
+                    return achievements
         
-        return achievements[:3]  # Limit to top 3
+        return achievements
     
-    def _optimize_education_section(self, education: List[Dict]) -> List[Dict]:
+    def _optimize_education_section(self, education: List[Dict]) -> List[EducationRecord]:
         """Optimize education section"""
         
         optimized_education = []
         
         for edu in education:
-            optimized_edu = {
-                "degree": edu.get('degree', ''),
-                "school": edu.get('school', ''),
-                "year": edu.get('year', ''),
-                "gpa": edu.get('gpa', '') if self._safe_float(edu.get('gpa', 0)) >= 3.5 else '',  # Only show good GPAs
-                "relevant_coursework": edu.get('relevant_coursework', []),
-                "honors": edu.get('honors', [])
-            }
+            optimized_edu = EducationRecord(
+                degree=edu.get('degree') or '',
+                school=edu.get('school') or '',
+                year=edu.get('year') or '',
+                gpa=(edu.get('gpa') or '') if self._safe_float(edu.get('gpa', 0)) >= 3.5 else '',  # Only show good GPAs
+                relevant_coursework=edu.get('relevant_coursework') or [],
+                honors=edu.get('honors') or []
+            )
             
             optimized_education.append(optimized_edu)
         
@@ -740,105 +1154,81 @@ class ResumeOptimizerService:
     def _determine_section_order(self, request: ResumeOptimizationRequest, optimization_strategy: Dict = None) -> List[str]:
         """Determine optimal section order based on optimization focus"""
         
-        base_order = ["personal_info", "professional_summary"]
-        
         # Use industry-specific section priorities if available
         if optimization_strategy and 'section_priorities' in optimization_strategy:
-            industry_priorities = optimization_strategy['section_priorities']
-            # Map industry sections to our section names
-            section_mapping = {
-                'technical_skills': 'skills_section',
-                'experience': 'experience_section',
-                'projects': 'projects_section',
-                'certifications': 'education_section',
-                'education': 'education_section',
-                'skills': 'skills_section',
-                'achievements': 'experience_section'
-            }
-            
-            # Add sections based on industry priorities
-            for priority in industry_priorities:
-                if priority in section_mapping:
-                    mapped_section = section_mapping[priority]
-                    if mapped_section not in base_order:
-                        base_order.append(mapped_section)
-            
-            # Add any remaining sections
-            all_sections = ["experience_section", "skills_section", "education_section", "projects_section"]
-            for section in all_sections:
-                if section not in base_order:
-                    base_order.append(section)
+            priorities = tuple(optimization_strategy['section_priorities'])
+            order = self.industry_section_orders.get(priorities)
+            if order is None:
+                order = _industry_section_order(priorities)
         else:
             # Fallback to optimization focus-based ordering
-            if request.optimization_focus == "technical":
-                base_order.extend(["skills_section", "projects_section", "experience_section", "education_section"])
-            elif request.optimization_focus == "executive":
-                base_order.extend(["experience_section", "education_section", "skills_section"])
-            else:  # ats, creative
-                base_order.extend(["experience_section", "skills_section", "education_section", "projects_section"])
+            order = FOCUS_SECTION_ORDERS.get(request.optimization_focus, DEFAULT_SECTION_ORDER)
+        
+        return list(order)
+    
+    def _normalize_scoring_text(self, optimized_data: Dict) -> Dict[str, str]:
+        """Lowercase the summary, experience and skills text once for the scoring passes"""
         
-        return base_order
+        experience_text = ' '.join(
+            ' '.join(exp.get('description', [])) for exp in optimized_data.get('experience_section', [])
+        )
+        
+        return {
+            'summary': (optimized_data.get('professional_summary') or '').lower(),
+            'experience': experience_text.lower(),
+            'skills': ' '.join(optimized_data.get('skills_section', {}).get('all_skills', [])).lower()
+        }
     
-    def _calculate_ats_score(self, optimized_data: Dict, job_requirements: Dict) -> float:
+    def _calculate_ats_score(self, optimized_data: Dict, job_requirements: Dict,
+                             normalized_text: Optional[Dict[str, str]] = None) -> float:
         """Calculate ATS compatibility score"""
         
-        score = 0.0
-        max_score = 100.0
+        normalized_text = normalized_text or self._normalize_scoring_text(optimized_data)
         
-        # Check for required keywords
+        # Check for required keywords with a single automaton pass over the skills
         required_skills = job_requirements.get('required_skills', [])
-        skills_text = ' '.join(optimized_data.get('skills_section', {}).get('all_skills', []))
-        
-        keyword_matches = 0
-        for skill in required_skills:
-            if skill.lower() in skills_text.lower():
-                keyword_matches += 1
+        required_lower = [skill.lower() for skill in required_skills]
         
-        if required_skills:
-            score += (keyword_matches / len(required_skills)) * 40  # 40% for keyword matching
+        found_skills = find_keywords(get_keyword_automaton(tuple(required_lower)), normalized_text['skills'])
+        keyword_matches = sum(1 for skill in required_lower if skill in found_skills)
         
         # Check for action verbs in experience
-        experience_text = ''
-        for exp in optimized_data.get('experience_section', []):
-            experience_text += ' '.join(exp.get('description', []))
-        
-        action_verb_count = 0
-        for verb in self.ats_keywords["action_verbs"][:10]:
-            if verb.lower() in experience_text.lower():
-                action_verb_count += 1
-        
-        score += min(action_verb_count * 3, 30)  # 30% for action verbs
-        
-        # Check for quantified achievements
-        if any('achievements' in exp and exp['achievements'] for exp in optimized_data.get('experience_section', [])):
-            score += 20  # 20% for quantified achievements
+        experience_words = set(_WORD_RE.findall(normalized_text['experience']))
+        action_verb_count = len(experience_words & self._top_action_verbs_set)
         
-        # Check section structure
-        if optimized_data.get('professional_summary'):
-            score += 10  # 10% for professional summary
+        # Check for quantified achievements and section structure
+        has_achievements = optimized_data.get('_has_quantified_achievements')
+        if has_achievements is None:
+            has_achievements = any(exp.get('achievements') for exp in optimized_data.get('experience_section', []))
+        has_summary = bool(optimized_data.get('professional_summary'))
         
-        return min(score, max_score) / max_score
+        return ats_score(keyword_matches, len(required_skills), action_verb_count, has_achievements, has_summary)
     
-    def _calculate_keyword_density(self, optimized_data: Dict, job_requirements: Dict) -> Dict[str, int]:
+    def _calculate_keyword_density(self, optimized_data: Dict, job_requirements: Dict,
+                                   normalized_text: Optional[Dict[str, str]] = None) -> Dict[str, int]:
         """Calculate keyword density for job requirements"""
         
-        # Combine all text content
-        all_text = ''
-        all_text += optimized_data.get('professional_summary', '') + ' '
-        
-        for exp in optimized_data.get('experience_section', []):
-            all_text += ' '.join(exp.get('description', [])) + ' '
+        normalized_text = normalized_text or self._normalize_scoring_text(optimized_data)
         
-        all_text += ' '.join(optimized_data.get('skills_section', {}).get('all_skills', []))
-        
-        all_text = all_text.lower()
+        # Tokenize once and count n-grams per skill length, so each skill is a
+        # dict lookup; matching whole tokens keeps "java" out of "javascript"
+        tokens = []
+        for section in ('summary', 'experience', 'skills'):
+            tokens.extend(_TOKEN_RE.findall(normalized_text[section]))
+        ngram_counts = {}
         
         # Count keywords
         keyword_counts = {}
         required_skills = job_requirements.get('required_skills', [])
         
         for skill in required_skills:
-            count = all_text.count(skill.lower())
+            skill_tokens = tuple(_TOKEN_RE.findall(skill.lower()))
+            if not skill_tokens:
+                continue
+            n = len(skill_tokens)
+            if n not in ngram_counts:
+                ngram_counts[n] = Counter(zip(*(tokens[i:] for i in range(n))))
+            count = ngram_counts[n].get(skill_tokens, 0)
             if count > 0:
                 keyword_counts[skill] = count
         
@@ -892,11 +1282,14 @@ class ResumeOptimizerService:
         experience_section = optimized_data.get('experience_section', [])
         total_keywords_added = 0
         ai_optimized_count = 0
+        achievements_count = 0
         
+        # Gather every experience metric in one pass
         for exp in experience_section:
             if exp.get('optimization_applied'):
                 ai_optimized_count += 1
-            total_keywords_added += len(exp.get('keywords_added', []))
+            total_keywords_added += len(exp.get('keywords_added', ()))
+            achievements_count += len(exp.get('achievements', ()))
         
         if ai_optimized_count > 0:
             improvements.append(f"AI-rewritten {ai_optimized_count} experience sections with stronger action verbs and impact focus")
@@ -905,7 +1298,6 @@ class ResumeOptimizerService:
             improvements.append(f"Added {total_keywords_added} job-relevant keywords throughout experience descriptions")
         
         # Check for quantified achievements
-        achievements_count = sum(len(exp.get('achievements', [])) for exp in experience_section)
         if achievements_count > 0:
             improvements.append(f"Identified and highlighted {achievements_count} quantifiable achievements")
         
@@ -926,7 +1318,14 @@ class ResumeOptimizerService:
     
     def _safe_float(self, value) -> float:
         """Safely convert value to float"""
+        if isinstance(value, (int, float)):
+            return float(value)
         try:
-            return float(value) if value else 0.0
-        except (ValueError, TypeError):
-            return 0.0
\ No newline at end of file
+            return _parse_float(value)
+        except TypeError:
+            # Unhashable values can't be memoized
+            return 0.0
+    
+    def clear_cache(self):
+        """Clear cached AI bullet rewrites"""
+        self.rewrite_cache.clear()
@@ -1,13 +1,145 @@
+import hashlib
+import io
+import mmap
 import os
 import tempfile
+import zipfile
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import BinaryIO, Dict, List, Optional, Union
 import re
 import pymupdf  # PyMuPDF
 import pdfplumber
 from docx import Document
+from lxml import etree
 from pydantic import BaseModel
 
+# Contact details
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# Searching _EMAIL_RE directly re-scans every local-part run from each of its word
+# boundaries, which is quadratic on long runs without an '@' (e.g. "a.a.a.a...")
+_EMAIL_DOMAIN_RE = re.compile(r'@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_EMAIL_LOCAL_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+_PHONE_RES = (
+    re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),  # US format
+    re.compile(r'\(\d{3}\)\s*\d{3}[-.]?\d{4}'),   # (123) 456-7890
+    re.compile(r'\+\d{1,3}[-.\s]?\d{1,14}'),      # International
+)
+_LINKEDIN_RE = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
+_NAME_RE = re.compile(r'^[A-Za-z\s]{2,50}$')
+# Lowercased lines containing any of these are never taken as the name
+_NAME_SKIP_RE = re.compile(r'email|phone|resume|cv|@')
+
+# WordprocessingML element tags read straight from word/document.xml
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W_P = f'{{{_W_NS}}}p'
+_W_R = f'{{{_W_NS}}}r'
+_W_T = f'{{{_W_NS}}}t'
+_W_BR = f'{{{_W_NS}}}br'
+_W_HYPERLINK = f'{{{_W_NS}}}hyperlink'
+_W_TBL = f'{{{_W_NS}}}tbl'
+_W_TYPE = f'{{{_W_NS}}}type'
+_W_VAL = f'{{{_W_NS}}}val'
+# Run children with a fixed text equivalent; w:t and w:br are handled separately
+_W_RUN_CHARS = {
+    f'{{{_W_NS}}}tab': '\t',
+    f'{{{_W_NS}}}ptab': '\t',
+    f'{{{_W_NS}}}cr': '\n',
+    f'{{{_W_NS}}}noBreakHyphen': '-',
+}
+_W_XPATH = {'w': _W_NS}
+
+
+def _search_email(text: str) -> Optional[str]:
+    """First _EMAIL_RE match in text, found in linear time by anchoring on each '@'"""
+    at = text.find('@')
+    while at != -1:
+        domain = _EMAIL_DOMAIN_RE.match(text, at)
+        if domain:
+            # The local part is the run of local-part characters right before the '@'
+            start = at
+            while start and text[start - 1] in _EMAIL_LOCAL_CHARS:
+                start -= 1
+            if start < at:
+                email_match = _EMAIL_RE.search(text, start, domain.end())
+                if email_match:
+                    return email_match.group()
+        at = text.find('@', at + 1)
+    return None
+
+
+def _docx_run_text(run) -> str:
+    """Text of a <w:r> element from its own children, matching python-docx's run.text"""
+    parts = []
+    for node in run:
+        if node.tag == _W_T:
+            parts.append(node.text or '')
+        elif node.tag == _W_BR:
+            # Only line breaks are text; page and column breaks read as nothing
+            if node.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            parts.append(_W_RUN_CHARS.get(node.tag, ''))
+    return ''.join(parts)
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a <w:p> element, matching python-docx's paragraph.text
+
+    Only the paragraph's own runs and hyperlink runs are read, so text boxes
+    anchored in a run (and their mc:Fallback copy) are left out.
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            parts.append(_docx_run_text(child))
+        elif child.tag == _W_HYPERLINK:
+            parts.extend(_docx_run_text(run) for run in child.iterfind('w:r', _W_XPATH))
+    return ''.join(parts)
+
+
+def _docx_table_rows(table) -> List[List[str]]:
+    """Cell texts of each <w:tbl> row, repeating merged cells the way python-docx's row.cells does"""
+    column_count = len(table.findall('w:tblGrid/w:gridCol', _W_XPATH))
+    rows = table.findall('w:tr', _W_XPATH)
+    
+    # One entry per layout grid slot: horizontal spans repeat the cell to the
+    # left, vertically merged continuations repeat the cell above
+    cells = []
+    for row in rows:
+        for cell in row.iterfind('w:tc', _W_XPATH):
+            grid_span = cell.find('w:tcPr/w:gridSpan', _W_XPATH)
+            v_merge = cell.find('w:tcPr/w:vMerge', _W_XPATH)
+            continues_above = v_merge is not None and v_merge.get(_W_VAL, 'continue') == 'continue'
+            for span_index in range(1 if grid_span is None else int(grid_span.get(_W_VAL))):
+                if continues_above:
+                    cells.append(cells[-column_count])
+                elif span_index > 0:
+                    cells.append(cells[-1])
+                else:
+                    cells.append("\n".join(_docx_paragraph_text(p) for p in cell.iterfind('w:p', _W_XPATH)))
+    
+    return [cells[index * column_count:(index + 1) * column_count] for index in range(len(rows))]
+
+
+# Extracted PDF text keyed by a digest of the file bytes
+PDF_TEXT_CACHE_SIZE = 64
+_PDF_TEXT_CACHE: Dict[bytes, str] = {}
+
+# Section headers, one lookahead per section so a line is tested with a single
+# match() while earlier sections still win when a line mentions several.
+# Headers like "work experience" or "technical skills" are covered by their
+# last word, so only the shortest distinct keywords are tried at each offset
+_SECTION_RE = re.compile(
+    r'(?=.*?(?P<experience>experience|employment))'
+    r'|(?=.*?(?P<education>education|academic|qualifications))'
+    r'|(?=.*?(?P<skills>skills|core\s+competencies|technologies))'
+    r'|(?=.*?(?P<projects>projects))'
+    r'|(?=.*?(?P<certifications>certificat(?:ions|es)|licenses))',
+    re.IGNORECASE
+)
+
 class ParsedResumeData(BaseModel):
     """Structured resume data model"""
     personal_info: Dict[str, Optional[str]] = {}
@@ -17,40 +149,116 @@ class ParsedResumeData(BaseModel):
     projects: List[Dict[str, str]] = []
     certifications: List[str] = []
     languages: List[str] = []
+    raw_text: str = ""
 
 class ResumeParserService:
     """Service for parsing resume files and extracting structured data"""
     
-    ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
+    ALLOWED_EXTENSIONS = frozenset({'.pdf', '.docx', '.txt'})
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    # Magic bytes expected in the file header (PDF allows leading junk, DOCX is a zip)
+    FILE_SIGNATURES = {'.pdf': b'%PDF', '.docx': b'PK\x03\x04'}
     
     def __init__(self):
-        self.temp_dir = tempfile.mkdtemp(prefix="resume_parser_")
+        self._temp_dir: Optional[str] = None
+    
+    @property
+    def temp_dir(self) -> str:
+        """Scratch directory for this parser, created on first use"""
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="resume_parser_")
+        return self._temp_dir
     
     def validate_file(self, file_path: str, file_size: int) -> tuple[bool, str]:
-        """Validate file type and size"""
-        path = Path(file_path)
+        """Validate file type, size and signature before any extraction work"""
+        extension = Path(file_path).suffix.lower()
         
         # Check file extension
-        if path.suffix.lower() not in self.ALLOWED_EXTENSIONS:
-            return False, f"Unsupported file type. Allowed: {', '.join(self.ALLOWED_EXTENSIONS)}"
+        message = self._check_extension(extension)
+        if message:
+            return False, message
         
-        # Check file size
+        # Reject an oversized reported size before touching the disk
         if file_size > self.MAX_FILE_SIZE:
-            return False, f"File too large. Max size: {self.MAX_FILE_SIZE / (1024*1024):.1f}MB"
+            return False, self._check_size(file_size, file_size)
+        
+        # Check file size on disk as well as the reported size
+        message = self._check_size(os.path.getsize(file_path), file_size)
+        if message:
+            return False, message
+        
+        # Check the file signature so misnamed files never reach the PDF/DOCX parsers
+        if extension in self.FILE_SIGNATURES:
+            with open(file_path, 'rb') as file:
+                message = self._check_signature(extension, file.read(1024))
+            if message:
+                return False, message
         
         return True, "Valid file"
     
+    def validate_bytes(self, data: bytes, file_size: int, extension: str) -> tuple[bool, str]:
+        """Validate in-memory file contents the same way validate_file checks a file"""
+        message = (
+            self._check_extension(extension)
+            or self._check_size(len(data), file_size)
+            or self._check_signature(extension, data[:1024])
+        )
+        if message:
+            return False, message
+        return True, "Valid file"
+    
+    def _check_extension(self, extension: str) -> Optional[str]:
+        if extension not in self.ALLOWED_EXTENSIONS:
+            return f"Unsupported file type. Allowed: {', '.join(self.ALLOWED_EXTENSIONS)}"
+        return None
+    
+    def _check_size(self, real_size: int, file_size: int) -> Optional[str]:
+        if real_size == 0:
+            return "Resume file is empty"
+        if max(real_size, file_size) > self.MAX_FILE_SIZE:
+            return f"File size exceeds maximum of {self.MAX_FILE_SIZE / (1024*1024):.1f}MB"
+        return None
+    
+    def _check_signature(self, extension: str, header: bytes) -> Optional[str]:
+        signature = self.FILE_SIGNATURES.get(extension)
+        if signature and signature not in header:
+            return f"File content does not match its {extension} extension"
+        return None
+    
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF using multiple methods"""
-        text = ""
+        try:
+            with open(file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return self._extract_pdf_text(b'')
+                # Map the file so a cache hit only hashes the page cache instead of copying the file
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self._extract_pdf_text(mapped)
+        except OSError as e:
+            raise ValueError(f"Could not read PDF file: {e}")
+    
+    def _extract_pdf_text(self, data: Union[bytes, mmap.mmap]) -> str:
+        """Extract PDF text from its bytes, reusing the extraction of identical uploads"""
+        cache_key = hashlib.blake2b(data, digest_size=16).digest()
+        text = _PDF_TEXT_CACHE.get(cache_key)
+        if text is None:
+            # The PDF libraries need real bytes, so a mapped file is only copied on a miss
+            text = self._extract_pdf_bytes(data if isinstance(data, bytes) else data[:])
+            if len(_PDF_TEXT_CACHE) >= PDF_TEXT_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _PDF_TEXT_CACHE[next(iter(_PDF_TEXT_CACHE))]
+            _PDF_TEXT_CACHE[cache_key] = text
+        return text
+    
+    def _extract_pdf_bytes(self, data: bytes) -> str:
+        """Extract text from in-memory PDF bytes, trying PyMuPDF then pdfplumber"""
         
-        # Method 1: Try PyMuPDF first
+        # Method 1: Try PyMuPDF first. Pages are extracted serially: PyMuPDF holds the GIL,
+        # so threads don't help, and forking worker processes per upload costs more than it saves
         try:
-            doc = pymupdf.open(file_path)
-            for page in doc:
-                text += page.get_text() + "\n"
-            doc.close()
+            with pymupdf.open(stream=data, filetype='pdf') as doc:
+                pages = [page.get_text() for page in doc]
+            text = "\n".join(pages)
             if text.strip():
                 return text
         except Exception as e:
@@ -58,11 +266,9 @@ class ResumeParserService:
         
         # Method 2: Fallback to pdfplumber
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                pages = [page_text for page_text in (page.extract_text() for page in pdf.pages) if page_text]
+            text = "\n".join(pages)
             if text.strip():
                 return text
         except Exception as e:
@@ -70,8 +276,14 @@ class ResumeParserService:
         
         raise ValueError("Could not extract text from PDF")
     
-    def extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+    def extract_text_from_docx(self, file_path: Union[str, BinaryIO]) -> str:
+        """Extract text from a DOCX file path or binary file object"""
+        try:
+            return self._extract_docx_xml(file_path)
+        except Exception:
+            pass
+        
+        # Fall back to the python-docx object model
         try:
             doc = Document(file_path)
             text = []
@@ -94,6 +306,27 @@ class ResumeParserService:
         except Exception as e:
             raise ValueError(f"Could not extract text from DOCX: {e}")
     
+    def _extract_docx_xml(self, file_path: Union[str, BinaryIO]) -> str:
+        """Extract DOCX text in one lxml walk over the body: paragraphs first, then table rows"""
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open('word/document.xml') as document_xml:
+                body = etree.parse(document_xml).getroot().find('w:body', _W_XPATH)
+        
+        paragraphs = []
+        table_rows = []
+        for element in body:
+            if element.tag == _W_P:
+                paragraph_text = _docx_paragraph_text(element)
+                if paragraph_text.strip():
+                    paragraphs.append(paragraph_text)
+            elif element.tag == _W_TBL:
+                for row_cells in _docx_table_rows(element):
+                    row_text = [cell_text.strip() for cell_text in row_cells if cell_text.strip()]
+                    if row_text:
+                        table_rows.append(" | ".join(row_text))
+        
+        return "\n".join(paragraphs + table_rows)
+    
     def extract_text_from_txt(self, file_path: str) -> str:
         """Extract text from TXT file"""
         try:
@@ -123,8 +356,23 @@ class ResumeParserService:
         else:
             raise ValueError(f"Unsupported file type: {extension}")
     
-    def extract_personal_info(self, text: str) -> Dict[str, Optional[str]]:
-        """Extract personal information from resume text"""
+    def extract_text_from_bytes(self, data: bytes, extension: str) -> str:
+        """Extract text from in-memory file contents based on file type"""
+        if extension == '.pdf':
+            return self._extract_pdf_text(data)
+        elif extension == '.docx':
+            return self.extract_text_from_docx(io.BytesIO(data))
+        elif extension == '.txt':
+            # Decode like extract_text_from_txt, including its newline translation
+            try:
+                return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()
+            except UnicodeDecodeError:
+                return io.TextIOWrapper(io.BytesIO(data), encoding='latin-1').read()
+        else:
+            raise ValueError(f"Unsupported file type: {extension}")
+    
+    def extract_personal_info(self, text: str, lines: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """Extract personal information from resume text, reusing its split lines when given"""
         personal_info = {
             "name": None,
             "email": None,
@@ -134,44 +382,37 @@ class ResumeParserService:
         }
         
         # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            personal_info["email"] = email_match.group()
+        personal_info["email"] = _search_email(text)
         
         # Extract phone number
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # US format
-            r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',   # (123) 456-7890
-            r'\+\d{1,3}[-.\s]?\d{1,14}',      # International
-        ]
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, text)
+        for phone_re in _PHONE_RES:
+            phone_match = phone_re.search(text)
             if phone_match:
                 personal_info["phone"] = phone_match.group()
                 break
         
         # Extract LinkedIn
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin_match = re.search(linkedin_pattern, text, re.IGNORECASE)
+        linkedin_match = _LINKEDIN_RE.search(text)
         if linkedin_match:
             personal_info["linkedin"] = linkedin_match.group()
         
         # Extract name (first few lines, excluding email/phone)
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        for line in lines[:5]:  # Check first 5 lines
+        if lines is None:
+            lines = text.split('\n')
+        candidate_lines = islice((line.strip() for line in lines if line.strip()), 5)
+        for line in candidate_lines:  # Check first 5 lines
             # Skip lines with email, phone, or common headers
-            if any(skip in line.lower() for skip in ['email', 'phone', 'resume', 'cv', '@']):
+            if _NAME_SKIP_RE.search(line.lower()):
                 continue
             # Look for likely name (2-4 words, mostly letters)
-            if re.match(r'^[A-Za-z\s]{2,50}$', line) and 2 <= len(line.split()) <= 4:
+            if _NAME_RE.match(line) and 2 <= len(line.split()) <= 4:
                 personal_info["name"] = line
                 break
         
         return personal_info
     
-    def extract_sections(self, text: str) -> Dict[str, List[str]]:
-        """Extract different sections from resume text"""
+    def extract_sections(self, text: Union[str, List[str]]) -> Dict[str, List[str]]:
+        """Extract different sections from resume text or its already split lines"""
         sections = {
             "experience": [],
             "education": [],
@@ -180,17 +421,8 @@ class ResumeParserService:
             "certifications": []
         }
         
-        # Define section headers
-        section_patterns = {
-            "experience": r'(work\s+experience|experience|employment|professional\s+experience)',
-            "education": r'(education|academic|qualifications)',
-            "skills": r'(skills|technical\s+skills|core\s+competencies|technologies)',
-            "projects": r'(projects|personal\s+projects|side\s+projects)',
-            "certifications": r'(certifications|certificates|licenses)'
-        }
-        
         # Split text into lines and process
-        lines = text.split('\n')
+        lines = text.split('\n') if isinstance(text, str) else text
         current_section = None
         current_content = []
         
@@ -200,11 +432,8 @@ class ResumeParserService:
                 continue
             
             # Check if line is a section header
-            section_found = None
-            for section_name, pattern in section_patterns.items():
-                if re.search(pattern, line, re.IGNORECASE):
-                    section_found = section_name
-                    break
+            section_match = _SECTION_RE.match(line)
+            section_found = section_match.lastgroup if section_match else None
             
             if section_found:
                 # Save previous section content
@@ -223,23 +452,41 @@ class ResumeParserService:
         
         return sections
     
-    def parse_resume(self, file_path: str, file_size: int) -> ParsedResumeData:
-        """Main method to parse resume and return structured data"""
-        # Validate file
-        is_valid, message = self.validate_file(file_path, file_size)
-        if not is_valid:
-            raise ValueError(message)
-        
-        # Extract raw text
-        raw_text = self.extract_text(file_path)
+    def parse_resume(
+        self,
+        source: Union[str, BinaryIO],
+        file_size: int,
+        *,
+        suffix: Optional[str] = None
+    ) -> ParsedResumeData:
+        """Main method to parse a resume file path, or an in-memory file with its suffix, into structured data"""
+        if isinstance(source, str):
+            # Validate file
+            is_valid, message = self.validate_file(source, file_size)
+            if not is_valid:
+                raise ValueError(message)
+            
+            # Extract raw text
+            raw_text = self.extract_text(source)
+        else:
+            data = source.read()
+            extension = (suffix or '').lower()
+            is_valid, message = self.validate_bytes(data, file_size, extension)
+            if not is_valid:
+                raise ValueError(message)
+            
+            raw_text = self.extract_text_from_bytes(data, extension)
         if not raw_text.strip():
             raise ValueError("No text could be extracted from the file")
         
+        # Split once; both extractors walk the same lines
+        lines = raw_text.split('\n')
+        
         # Extract personal information
-        personal_info = self.extract_personal_info(raw_text)
+        personal_info = self.extract_personal_info(raw_text, lines)
         
         # Extract sections
-        sections = self.extract_sections(raw_text)
+        sections = self.extract_sections(lines)
         
         # Create structured data
         parsed_data = ParsedResumeData(
@@ -248,15 +495,37 @@ class ResumeParserService:
             education=[{"content": "\n".join(sections["education"])}] if sections["education"] else [],
             skills=sections["skills"],
             projects=[{"content": "\n".join(sections["projects"])}] if sections["projects"] else [],
-            certifications=sections["certifications"]
+            certifications=sections["certifications"],
+            raw_text=raw_text
         )
         
         return parsed_data
     
+    def parse_resumes_parallel(self, file_paths: List[str]) -> List[ParsedResumeData]:
+        """Parse many resume files across worker processes, returning results in input order"""
+        if len(file_paths) < 2:
+            return [_parse_one(file_path) for file_path in file_paths]
+        
+        workers = min(os.cpu_count() or 1, len(file_paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_one, file_paths))
+    
     def cleanup(self):
         """Clean up temporary files"""
+        if self._temp_dir is None:
+            return
         try:
             import shutil
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
         except Exception:
-            pass
\ No newline at end of file
+            pass
+        self._temp_dir = None
+
+
+def _parse_one(file_path: str) -> ParsedResumeData:
+    """Parse one resume file with its own parser, for use in bulk parsing worker processes"""
+    parser = ResumeParserService()
+    try:
+        return parser.parse_resume(file_path, os.path.getsize(file_path))
+    finally:
+        parser.cleanup()
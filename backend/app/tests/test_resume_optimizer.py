@@ -0,0 +1,314 @@
+"""Test suite for Resume Optimizer Service"""
+import pytest
+import httpx
+from types import SimpleNamespace
+from openai import (
+    APIConnectionError, APITimeoutError, AuthenticationError, BadRequestError,
+    InternalServerError, RateLimitError
+)
+from tenacity import wait_none
+
+from app.services import resume_optimizer as resume_optimizer_module
+from app.services.resume_optimizer import (
+    EducationRecord,
+    ResumeOptimizationRequest,
+    ResumeOptimizerService,
+    parse_bullets
+)
+from app.services.industry_analyzer import IndustryType
+
+
+_RESUME_DATA = {
+    "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+    "experience": [
+        {"title": "Software Engineer", "company": "TechCorp", "content": "Built REST APIs in Python. Reduced latency by 30%."}
+    ],
+    "skills": ["Python", "JavaScript", "Docker"],
+    "education": [{"degree": "BSc Computer Science", "school": "State University", "year": "2018", "gpa": "3.8"}]
+}
+
+_JOB_REQUIREMENTS = {
+    "required_skills": ["Python", "Java", "machine learning"],
+    "job_description": "Backend engineer building Python services"
+}
+
+# Sections streamed before the final optimized resume, in order
+_STREAMED_SECTIONS = (
+    "personal_info", "professional_summary", "skills_section", "experience_section",
+    "education_section", "projects_section", "section_order"
+)
+
+_OPENAI_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(error_class, status_code: int):
+    return error_class("error", response=httpx.Response(status_code, request=_OPENAI_REQUEST), body=None)
+
+
+class _FakeStream:
+    """OpenAI chat completion stream sending a reply a few characters per chunk"""
+    
+    def __init__(self, reply: str, chunk_size: int = 3):
+        self.chunks = [reply[i:i + chunk_size] for i in range(0, len(reply), chunk_size)]
+        self.sent = 0
+        self.closed = False
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        if self.closed or self.sent == len(self.chunks):
+            raise StopAsyncIteration
+        self.sent += 1
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.chunks[self.sent - 1]))])
+    
+    async def close(self):
+        self.closed = True
+
+
+class TestResumeOptimizerService:
+    """Test suite for Resume Optimizer Service"""
+    
+    @pytest.fixture(scope="module")
+    def optimizer_service(self):
+        """Create one resume optimizer service shared by the module; tests override it through monkeypatch"""
+        return ResumeOptimizerService()
+    
+    @pytest.fixture(autouse=True)
+    def disable_ai_providers(self, monkeypatch, optimizer_service):
+        """Start every test with the AI providers off and an empty rewrite cache"""
+        monkeypatch.setattr(optimizer_service, "_openai_clients", None)
+        monkeypatch.setattr(optimizer_service, "openai_enabled", False)
+        monkeypatch.setattr(optimizer_service, "gemini_model", None)
+        monkeypatch.setattr(optimizer_service, "gemini_enabled", False)
+        optimizer_service.clear_cache()
+        yield
+        optimizer_service.clear_cache()
+    
+    @pytest.fixture(scope="module")
+    def optimization_request(self):
+        """Create a sample optimization request"""
+        return ResumeOptimizationRequest(target_job_title="Backend Engineer")
+    
+    @pytest.fixture
+    def fake_rewrites(self, monkeypatch, optimizer_service):
+        """Enable AI rewriting with a fake that records each rewritten description"""
+        calls = []
+        
+        async def rewrite(description, job_requirements, industry=IndustryType.GENERAL):
+            calls.append(description)
+            return [f"Rewrote: {description}"]
+        
+        async def no_achievements(description):
+            return []
+        
+        monkeypatch.setattr(optimizer_service, "openai_enabled", True)
+        monkeypatch.setattr(optimizer_service, "_ai_optimize_job_description", rewrite)
+        monkeypatch.setattr(optimizer_service, "_ai_extract_achievements", no_achievements)
+        return calls
+    
+    @pytest.fixture
+    def no_retry_wait(self, monkeypatch):
+        """Retry OpenAI calls without the backoff sleeps"""
+        monkeypatch.setattr(ResumeOptimizerService._create_chat_completion.retry, "wait", wait_none())
+    
+    @pytest.mark.asyncio
+    async def test_stream_optimization_events_order(self, optimizer_service, optimization_request):
+        """Test sections are streamed in order before one complete event with the whole resume"""
+        events = [
+            event async for event in optimizer_service.stream_optimization_events(
+                _RESUME_DATA, _JOB_REQUIREMENTS, optimization_request
+            )
+        ]
+        
+        assert [event["type"] for event in events] == ["section"] * len(_STREAMED_SECTIONS) + ["complete"]
+        assert tuple(event["section"] for event in events[:-1]) == _STREAMED_SECTIONS
+        
+        complete = events[-1]["data"]
+        assert complete["section_order"] == events[-2]["data"]
+        assert complete["education_section"][0]["degree"] == "BSc Computer Science"
+        assert 0.0 <= complete["ats_score"] <= 1.0
+    
+    @pytest.mark.asyncio
+    async def test_stream_optimization_events_error(self, monkeypatch, optimizer_service, optimization_request):
+        """Test a failing section ends the stream with an error event and no complete event"""
+        def fail(*args, **kwargs):
+            raise ValueError("skills failed")
+        
+        monkeypatch.setattr(optimizer_service, "_optimize_skills_section", fail)
+        
+        events = [
+            event async for event in optimizer_service.stream_optimization_events(
+                _RESUME_DATA, _JOB_REQUIREMENTS, optimization_request
+            )
+        ]
+        
+        assert [event.get("section") for event in events[:-1]] == ["personal_info", "professional_summary"]
+        assert events[-1] == {"type": "error", "message": "skills failed"}
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [
+        _status_error(RateLimitError, 429),
+        _status_error(InternalServerError, 500),
+        APIConnectionError(request=_OPENAI_REQUEST),
+        APITimeoutError(request=_OPENAI_REQUEST),
+    ], ids=["rate_limit", "server_error", "connection", "timeout"])
+    async def test_create_chat_completion_retries_transient_errors(self, optimizer_service, no_retry_wait, error):
+        """Test transient OpenAI failures are retried until a call succeeds"""
+        attempts = []
+        
+        async def create(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) < 3:
+                raise error
+            return "completion"
+        
+        optimizer_service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        
+        assert await optimizer_service._create_chat_completion(model="gpt-4o") == "completion"
+        assert len(attempts) == 3
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [
+        _status_error(AuthenticationError, 401),
+        _status_error(BadRequestError, 400),
+    ], ids=["authentication", "bad_request"])
+    async def test_create_chat_completion_does_not_retry_other_errors(self, optimizer_service, no_retry_wait, error):
+        """Test errors a retry can't fix are raised after one attempt"""
+        attempts = []
+        
+        async def create(**kwargs):
+            attempts.append(kwargs)
+            raise error
+        
+        optimizer_service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        
+        with pytest.raises(type(error)):
+            await optimizer_service._create_chat_completion(model="gpt-4o")
+        assert len(attempts) == 1
+    
+    @pytest.mark.asyncio
+    async def test_create_chat_completion_gives_up_after_three_attempts(self, optimizer_service, no_retry_wait):
+        """Test a persistent transient failure is raised after the last attempt"""
+        attempts = []
+        
+        async def create(**kwargs):
+            attempts.append(kwargs)
+            raise _status_error(RateLimitError, 429)
+        
+        optimizer_service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        
+        with pytest.raises(RateLimitError):
+            await optimizer_service._create_chat_completion(model="gpt-4o")
+        assert len(attempts) == 3
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_experience_rewritten_once(self, optimizer_service, optimization_request, fake_rewrites):
+        """Test identical experience descriptions share one AI rewrite"""
+        entry = {"title": "Engineer", "company": "TechCorp", "content": "Built REST APIs in Python."}
+        resume_data = {"experience": [entry, dict(entry, company="OtherCorp")]}
+        
+        experience = await optimizer_service._optimize_experience_section(resume_data, _JOB_REQUIREMENTS, optimization_request)
+        
+        assert fake_rewrites == ["Built REST APIs in Python."]
+        assert [exp["description"] for exp in experience] == [["Rewrote: Built REST APIs in Python."]] * 2
+        assert [exp["company"] for exp in experience] == ["TechCorp", "OtherCorp"]
+    
+    @pytest.mark.asyncio
+    async def test_rewrite_cache_reuses_rewrites_per_job(self, optimizer_service, fake_rewrites):
+        """Test a rewrite is reused for the same job and redone for different requirements"""
+        first = await optimizer_service._optimize_job_description("Built APIs.", _JOB_REQUIREMENTS)
+        first.append("caller edit")
+        second = await optimizer_service._optimize_job_description("Built APIs.", _JOB_REQUIREMENTS)
+        await optimizer_service._optimize_job_description("Built APIs.", {"required_skills": ["Go"]})
+        
+        assert second == ["Rewrote: Built APIs."]
+        assert fake_rewrites == ["Built APIs.", "Built APIs."]
+    
+    @pytest.mark.asyncio
+    async def test_rewrite_cache_evicts_least_recently_used(self, monkeypatch, optimizer_service, fake_rewrites):
+        """Test a cache hit keeps a rewrite over one that was used less recently"""
+        monkeypatch.setattr(resume_optimizer_module, "REWRITE_CACHE_SIZE", 2)
+        
+        for description in ("first", "second", "first", "third", "first", "second"):
+            await optimizer_service._optimize_job_description(description, _JOB_REQUIREMENTS)
+        
+        assert fake_rewrites == ["first", "second", "third", "second"]
+    
+    @pytest.mark.asyncio
+    async def test_empty_rewrite_falls_back_to_template_and_is_not_cached(self, monkeypatch, optimizer_service):
+        """Test an AI reply without bullets uses the template rewrite and asks the AI again next time"""
+        calls = []
+        
+        async def rewrite(description, job_requirements, industry=IndustryType.GENERAL):
+            calls.append(description)
+            return []
+        
+        monkeypatch.setattr(optimizer_service, "openai_enabled", True)
+        monkeypatch.setattr(optimizer_service, "_ai_optimize_job_description", rewrite)
+        description = "Built REST APIs in Python. Reduced latency by 30%."
+        
+        result = await optimizer_service._optimize_job_description(description, _JOB_REQUIREMENTS)
+        await optimizer_service._optimize_job_description(description, _JOB_REQUIREMENTS)
+        
+        assert result == optimizer_service._template_optimize_job_description(description, _JOB_REQUIREMENTS)
+        assert result
+        assert len(calls) == 2
+        assert not optimizer_service.rewrite_cache
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("reply,expected", [
+        ("• Built APIs\n\n• Cut latency\n\n• Led a team\n\nLet me know if you need more.",
+         "• Built APIs\n\n• Cut latency\n\n• Led a team"),
+        ("Here are the rewritten bullets:\n\n• Built APIs\n• Cut latency\n\nThese emphasize impact.",
+         "Here are the rewritten bullets:\n\n• Built APIs\n• Cut latency"),
+    ], ids=["blank_lines_between_bullets", "lead_in_paragraph"])
+    async def test_generate_text_stops_after_bullet_block(self, monkeypatch, optimizer_service, reply, expected):
+        """Test a bullet rewrite is read up to the end of the whole bullet block, then the stream is closed"""
+        stream = _FakeStream(reply)
+        
+        async def create(**kwargs):
+            return stream
+        
+        monkeypatch.setattr(optimizer_service, "openai_enabled", True)
+        optimizer_service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        
+        text = await optimizer_service._generate_text("system", "prompt", 0.5, 200, stop_after_bullets=True)
+        
+        assert text == expected
+        assert parse_bullets(text) == [line.lstrip("• ") for line in expected.splitlines() if line.startswith("•")]
+        assert stream.closed
+        assert stream.sent < len(stream.chunks)
+    
+    def test_keyword_density_counts_whole_tokens(self, optimizer_service):
+        """Test keyword density counts whole tokens and phrases, so "java" isn't found in "javascript\""""
+        optimized_data = {
+            "professional_summary": "Python developer with machine learning experience",
+            "experience_section": [{"description": ["Built JavaScript and Python services", "Applied machine learning"]}],
+            "skills_section": {"all_skills": ["Python", "JavaScript"]}
+        }
+        
+        density = optimizer_service._calculate_keyword_density(optimized_data, _JOB_REQUIREMENTS)
+        
+        assert density == {"Python": 3, "machine learning": 2}
+    
+    def test_ats_score_matches_action_verbs_as_whole_words(self, optimizer_service):
+        """Test action verbs only count as whole words, so "redeveloped" doesn't count as "developed\""""
+        def score(bullet):
+            optimized_data = {"experience_section": [{"description": [bullet], "achievements": []}]}
+            return optimizer_service._calculate_ats_score(optimized_data, {})
+        
+        assert score("Redeveloped the reporting pipeline") == score("Rewrote the reporting pipeline")
+        assert score("Developed the reporting pipeline") > score("Rewrote the reporting pipeline")
+    
+    def test_optimize_education_section_returns_records(self, optimizer_service):
+        """Test education entries become EducationRecords that only keep a GPA of 3.5 or more"""
+        education = optimizer_service._optimize_education_section([
+            {"degree": "BSc", "school": "State University", "year": 2018, "gpa": "3.8"},
+            {"degree": "MSc", "school": "Tech Institute", "gpa": "3.1", "honors": None}
+        ])
+        
+        assert education == [
+            EducationRecord(degree="BSc", school="State University", year=2018, gpa="3.8"),
+            EducationRecord(degree="MSc", school="Tech Institute")
+        ]
@@ -1,24 +1,17 @@
 """Test suite for Resume Parser Service"""
 import pytest
-import tempfile
+import io
 import os
 from pathlib import Path
 
-from app.services.resume_parser import ResumeParserService, ParsedResumeData
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 
+from app.services.resume_parser import ResumeParserService, ParsedResumeData
 
-class TestResumeParserService:
-    """Test suite for Resume Parser Service"""
-    
-    @pytest.fixture
-    def parser_service(self):
-        """Create resume parser service instance"""
-        return ResumeParserService()
-    
-    @pytest.fixture
-    def sample_text_resume(self):
-        """Create a sample text resume file"""
-        content = """
+_SAMPLE_RESUME_TEXT = """
         John Doe
         Software Engineer
         Email: john.doe@email.com
@@ -42,10 +35,39 @@ class TestResumeParserService:
         SKILLS
         Python, JavaScript, React, PostgreSQL, Docker, AWS
         """
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(content)
-            return f.name
+
+# A run anchoring a text box the way Word saves it: once as a DrawingML
+# shape and again as its VML fallback
+_TEXT_BOX_RUN = (
+    f'<w:r {nsdecls("w")} '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>SKILLS BOX</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>SKILLS BOX</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></w:pict></mc:Fallback>'
+    '</mc:AlternateContent></w:r>'
+)
+
+
+class TestResumeParserService:
+    """Test suite for Resume Parser Service"""
+    
+    @pytest.fixture
+    def parser_service(self):
+        """Create resume parser service instance"""
+        return ResumeParserService()
+    
+    @pytest.fixture(scope="module")
+    def sample_text_resume(self, tmp_path_factory):
+        """Write the sample text resume to one read-only file shared by the module"""
+        path = tmp_path_factory.mktemp("resumes") / "resume.txt"
+        path.write_text(_SAMPLE_RESUME_TEXT)
+        return str(path)
     
     def test_parse_text_resume_success(self, parser_service, sample_text_resume):
         """Test successful parsing of text resume"""
@@ -53,9 +75,6 @@ class TestResumeParserService:
         
         result = parser_service.parse_resume(sample_text_resume, file_size)
         
-        # Cleanup
-        os.unlink(sample_text_resume)
-        
         # Assertions
         assert isinstance(result, ParsedResumeData)
         assert result.personal_info['name'] == 'John Doe'
@@ -72,32 +91,100 @@ class TestResumeParserService:
     
     def test_parse_empty_file(self, parser_service):
         """Test parsing empty file"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write('')
-            empty_file = f.name
-        
-        file_size = os.path.getsize(empty_file)
-        
         with pytest.raises(ValueError, match="Resume file is empty"):
-            parser_service.parse_resume(empty_file, file_size)
-        
-        # Cleanup
-        os.unlink(empty_file)
+            parser_service.parse_resume(io.BytesIO(b''), 0, suffix='.txt')
     
     def test_parse_oversized_file(self, parser_service):
         """Test parsing file that exceeds size limit"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write('content')
-            oversized_file = f.name
-        
         # Simulate oversized file
         oversized_size = 50 * 1024 * 1024  # 50MB
         
         with pytest.raises(ValueError, match="File size exceeds maximum"):
-            parser_service.parse_resume(oversized_file, oversized_size)
+            parser_service.parse_resume(io.BytesIO(b'content'), oversized_size, suffix='.txt')
+    
+    @pytest.mark.parametrize("file_name,content", [
+        ("resume.pdf", b"PK\x03\x04 zip archive renamed to .pdf"),
+        ("resume.docx", b"%PDF-1.7 pdf renamed to .docx"),
+    ], ids=["pdf", "docx"])
+    def test_validate_file_rejects_mismatched_signature(self, parser_service, tmp_path, file_name, content):
+        """Test files whose magic bytes don't match their extension are rejected"""
+        file_path = tmp_path / file_name
+        file_path.write_bytes(content)
         
-        # Cleanup
-        os.unlink(oversized_file)
+        is_valid, message = parser_service.validate_file(str(file_path), len(content))
+        
+        assert is_valid is False
+        assert "does not match" in message
+    
+    def test_validate_file_checks_size_on_disk(self, parser_service, tmp_path, monkeypatch):
+        """Test the real file size is checked, not just the size the client reported"""
+        monkeypatch.setattr(parser_service, "MAX_FILE_SIZE", 16)
+        file_path = tmp_path / "resume.txt"
+        file_path.write_text("x" * 32)
+        
+        is_valid, message = parser_service.validate_file(str(file_path), 8)
+        
+        assert is_valid is False
+        assert "File size exceeds maximum" in message
+    
+    def test_validate_file_rejects_reported_oversize_without_reading(self, parser_service, tmp_path):
+        """Test an oversized reported size is rejected before the file is touched"""
+        is_valid, message = parser_service.validate_file(str(tmp_path / "missing.pdf"), 50 * 1024 * 1024)
+        
+        assert is_valid is False
+        assert "File size exceeds maximum" in message
+    
+    def test_parse_in_memory_resume_matches_file(self, parser_service, sample_text_resume):
+        """Test that parsing uploaded bytes gives the same result as parsing the saved file"""
+        with open(sample_text_resume, 'rb') as f:
+            content = f.read()
+        
+        from_file = parser_service.parse_resume(sample_text_resume, len(content))
+        from_memory = parser_service.parse_resume(io.BytesIO(content), len(content), suffix='.txt')
+        
+        assert from_memory == from_file
+    
+    def test_extract_text_from_docx_matches_python_docx(self, parser_service, tmp_path):
+        """Test DOCX extraction skips text boxes, drops page breaks and repeats merged cells like python-docx"""
+        doc = Document()
+        doc.add_paragraph("Jane Doe")._p.append(parse_xml(_TEXT_BOX_RUN))
+        paragraph = doc.add_paragraph("Summary")
+        paragraph.add_run().add_break(WD_BREAK.PAGE)
+        paragraph.add_run("Line one")
+        paragraph.add_run().add_break()
+        paragraph.add_run("line two")
+        
+        table = doc.add_table(rows=3, cols=3)
+        table.cell(0, 0).merge(table.cell(0, 1)).text = "Languages"
+        table.cell(0, 2).text = "Python"
+        table.cell(1, 0).merge(table.cell(2, 0)).text = "Tools"
+        table.cell(1, 1).text = "Docker"
+        table.cell(2, 2).text = "AWS"
+        
+        docx_path = tmp_path / "resume.docx"
+        doc.save(docx_path)
+        
+        text = parser_service.extract_text_from_docx(str(docx_path))
+        
+        assert text == (
+            "Jane Doe\n"
+            "SummaryLine one\nline two\n"
+            "Languages | Languages | Python\n"
+            "Tools | Docker\n"
+            "Tools | AWS"
+        )
+        assert parser_service._extract_docx_xml(str(docx_path)) == text
+    
+    def test_parse_resumes_parallel_keeps_order(self, parser_service, sample_text_resume, tmp_path):
+        """Test that bulk parsing matches one-by-one parsing, in input order"""
+        other_resume = tmp_path / "other_resume.txt"
+        other_resume.write_text("Jane Smith\njane.smith@example.com\n\nSKILLS\nGo, Rust")
+        paths = [sample_text_resume, str(other_resume), sample_text_resume]
+        
+        results = parser_service.parse_resumes_parallel(paths)
+        
+        assert results == [parser_service.parse_resume(path, os.path.getsize(path)) for path in paths]
+        assert results[1].personal_info["email"] == "jane.smith@example.com"
     
     def test_extract_personal_info(self, parser_service):
         """Test personal information extraction"""
@@ -229,21 +316,20 @@ class TestResumeParserService:
         assert is_valid is False
         assert len(issues) > 0
     
-    def test_supported_file_types(self, parser_service):
+    def test_supported_file_types(self, parser_service, tmp_path):
         """Test that all supported file types are recognized"""
         supported_types = ['.pdf', '.doc', '.docx', '.txt']
         
         for file_type in supported_types:
-            with tempfile.NamedTemporaryFile(suffix=file_type, delete=False) as f:
-                # Just test that the file type doesn't raise an error
-                try:
-                    # This would fail on content, but we're just testing type recognition
-                    parser_service.parse_resume(f.name, 100)
-                except (ValueError, Exception) as e:
-                    # We expect content-related errors, not file type errors
-                    assert "Unsupported file type" not in str(e)
-                finally:
-                    os.unlink(f.name)
+            file_path = tmp_path / f"resume{file_type}"
+            file_path.touch()
+            # Just test that the file type doesn't raise an error
+            try:
+                # This would fail on content, but we're just testing type recognition
+                parser_service.parse_resume(str(file_path), 100)
+            except (ValueError, Exception) as e:
+                # We expect content-related errors, not file type errors
+                assert "Unsupported file type" not in str(e)
     
     def test_performance_metrics(self, parser_service, sample_text_resume):
         """Test parsing performance is within acceptable limits"""
@@ -257,21 +343,6 @@ class TestResumeParserService:
         
         parsing_time = end_time - start_time
         
-        # Cleanup
-        os.unlink(sample_text_resume)
-        
         # Parsing should complete within 5 seconds for a simple resume
         assert parsing_time < 5.0
         assert result is not None
-    
-    def teardown_method(self):
-        """Cleanup after each test"""
-        # Remove any temporary files that might have been created
-        import glob
-        temp_files = glob.glob('/tmp/tmp*')
-        for temp_file in temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-            except:
-                pass  # Ignore cleanup errors
\ No newline at end of file
@@ -1,8 +1,27 @@
 """Diagnose OpenAI API issues"""
-from openai import OpenAI
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from openai import AsyncOpenAI, AuthenticationError, RateLimitError
 from app.core.config import settings
 
-def diagnose_openai():
+# Probed models with the prompt and label for each, cheaper model first
+PROBES = (
+    ("gpt-3.5-turbo", "Say 'API working'", "OpenAI API is working!"),
+    ("gpt-4o", "Say 'GPT-4o working'", "GPT-4o model is working!"),
+)
+
+# Successful diagnoses are reused for a while so repeated runs don't pay for new probes
+PROBE_CACHE_PATH = Path.home() / ".cache" / "resume-ai" / "openai_probe.json"
+PROBE_CACHE_TTL_SECONDS = 600
+# Set to any non-empty value to always send fresh probes, like --no-cache
+NO_CACHE_ENV = "RESUME_AI_NO_PROBE_CACHE"
+
+def diagnose_openai(use_cache: bool = True):
     """Diagnose OpenAI API connection and quota issues"""
     
     if not settings.OPENAI_API_KEY:
@@ -11,50 +30,100 @@ def diagnose_openai():
     
     print(f"API Key found: {settings.OPENAI_API_KEY[:10]}...{settings.OPENAI_API_KEY[-4:]}")
     
+    key_hash = hashlib.sha256(settings.OPENAI_API_KEY.encode()).hexdigest()
+    cached = _load_cached_probe(key_hash) if use_cache and not os.getenv(NO_CACHE_ENV) else None
+    if cached:
+        print(f"(cached) Reusing successful diagnosis from {int(time.time() - cached['checked_at'])}s ago; pass --no-cache to probe again")
+        for (_, _, success_message), content in zip(PROBES, cached["responses"]):
+            print(f"(cached) SUCCESS: {success_message}")
+            print(f"(cached) Response: {content}")
+        return
+    
+    responses = asyncio.run(_run_probes())
+    if responses is not None:
+        _save_probe(key_hash, responses)
+
+def _load_cached_probe(key_hash: str):
+    """Return the cached successful diagnosis for this key if it's still fresh"""
+    try:
+        cached = json.loads(PROBE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    
+    if cached.get("key_hash") != key_hash or time.time() - cached.get("checked_at", 0) > PROBE_CACHE_TTL_SECONDS:
+        return None
+    return cached
+
+def _save_probe(key_hash: str, responses):
+    """Remember a successful diagnosis; failing to write the cache is harmless"""
     try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        
-        # Try a minimal API call
-        print("Testing minimal OpenAI API call...")
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",  # Try cheaper model first
-            messages=[{"role": "user", "content": "Say 'API working'"}],
-            max_tokens=10
-        )
-        
-        print("SUCCESS: OpenAI API is working!")
-        print(f"Response: {response.choices[0].message.content}")
-        
-        # Now try GPT-4o
-        print("Testing GPT-4o model...")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": "Say 'GPT-4o working'"}],
-            max_tokens=10
+        PROBE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        PROBE_CACHE_PATH.write_text(json.dumps({"key_hash": key_hash, "checked_at": time.time(), "responses": responses}))
+    except OSError:
+        pass
+
+async def _run_probes():
+    """Send every probe at once over one client, report each outcome in order and return the responses if all succeeded"""
+    async with AsyncOpenAI(api_key=settings.OPENAI_API_KEY) as client:
+        print("Testing minimal OpenAI API call and GPT-4o model...")
+        results = await asyncio.gather(
+            *(
+                client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=10
+                )
+                for model, prompt, _ in PROBES
+            ),
+            return_exceptions=True
         )
-        
-        print("SUCCESS: GPT-4o model is working!")
-        print(f"Response: {response.choices[0].message.content}")
-        
-    except Exception as e:
-        error_msg = str(e)
-        print(f"ERROR: {error_msg}")
-        
-        if "insufficient_quota" in error_msg:
-            print("\nSOLUTION: Your OpenAI account needs billing setup or credits added")
-            print("1. Go to https://platform.openai.com/settings/organization/billing")
-            print("2. Add a payment method or purchase credits")
-            print("3. Check your usage at https://platform.openai.com/usage")
-            
-        elif "invalid_api_key" in error_msg:
-            print("\nSOLUTION: Invalid API key")
-            print("1. Check your API key at https://platform.openai.com/api-keys")
-            print("2. Make sure it's copied correctly to .env file")
-            
-        elif "rate_limit" in error_msg:
-            print("\nSOLUTION: Rate limit exceeded")
-            print("1. Wait a few minutes and try again")
-            print("2. Consider upgrading your OpenAI plan")
+    
+    responses = []
+    for (_, _, success_message), result in zip(PROBES, results):
+        if isinstance(result, Exception):
+            _explain_error(result)
+        else:
+            print(f"SUCCESS: {success_message}")
+            print(f"Response: {result.choices[0].message.content}")
+            responses.append(result.choices[0].message.content)
+    
+    return responses if len(responses) == len(PROBES) else None
+
+def _print_quota_help():
+    print("\nSOLUTION: Your OpenAI account needs billing setup or credits added")
+    print("1. Go to https://platform.openai.com/settings/organization/billing")
+    print("2. Add a payment method or purchase credits")
+    print("3. Check your usage at https://platform.openai.com/usage")
+
+def _print_invalid_key_help():
+    print("\nSOLUTION: Invalid API key")
+    print("1. Check your API key at https://platform.openai.com/api-keys")
+    print("2. Make sure it's copied correctly to .env file")
+
+def _print_rate_limit_help():
+    print("\nSOLUTION: Rate limit exceeded")
+    print("1. Wait a few minutes and try again")
+    print("2. Consider upgrading your OpenAI plan")
+
+# Hints by SDK exception type; an exhausted quota is a RateLimitError told apart by its code
+ERROR_HELP = {
+    AuthenticationError: _print_invalid_key_help,
+    RateLimitError: _print_rate_limit_help,
+}
+
+def _explain_error(e: Exception):
+    """Print an API error with the likely fix"""
+    print(f"ERROR: {e}")
+    
+    if getattr(e, "code", None) == "insufficient_quota":
+        _print_quota_help()
+        return
+    
+    print_help = ERROR_HELP.get(type(e))
+    if print_help:
+        print_help()
 
 if __name__ == "__main__":
-    diagnose_openai()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--no-cache", action="store_true", help=f"ignore a recent successful diagnosis and send fresh probes (or set {NO_CACHE_ENV})")
+    diagnose_openai(use_cache=not parser.parse_args().no_cache)
\ No newline at end of file